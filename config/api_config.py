@@ -5,14 +5,20 @@ Handles OpenAI GPT-4o, GitHub, and Google Cloud API settings.
 """
 
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import Dict, Optional
 
 from config.settings import get_settings
 
-settings = get_settings()
 
+@lru_cache(maxsize=1)
+def _user_agent() -> str:
+    """Build the User-Agent string sent to external APIs."""
+    settings = get_settings()
+    return f"{settings.app_name}/{settings.app_version}"
 
-@dataclass
+
+@dataclass(frozen=True)
 class OpenAIConfig:
     """OpenAI GPT-4o API configuration."""
     
@@ -24,13 +30,13 @@ class OpenAIConfig:
     max_retries: int = 3
     requests_per_minute: int = 50
     
-    @property
+    @cached_property
     def headers(self) -> Dict[str, str]:
         """Get HTTP headers for OpenAI API requests."""
         return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
-            "User-Agent": f"{settings.app_name}/{settings.app_version}"
+            "User-Agent": _user_agent()
         }
     
     @property
@@ -43,7 +49,7 @@ class OpenAIConfig:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class GitHubConfig:
     """GitHub API configuration."""
     
@@ -53,13 +59,13 @@ class GitHubConfig:
     max_retries: int = 3
     requests_per_hour: int = 5000
     
-    @property
+    @cached_property
     def headers(self) -> Dict[str, str]:
         """Get HTTP headers for GitHub API requests."""
         return {
             "Authorization": f"token {self.token}",
             "Accept": "application/vnd.github.v3+json",
-            "User-Agent": f"{settings.app_name}/{settings.app_version}"
+            "User-Agent": _user_agent()
         }
     
     @property
@@ -72,7 +78,7 @@ class GitHubConfig:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class GitHubMCPConfig:
     """GitHub MCP Server configuration."""
     
@@ -81,12 +87,12 @@ class GitHubMCPConfig:
     timeout: int = 30
     max_retries: int = 3
     
-    @property
+    @cached_property
     def headers(self) -> Dict[str, str]:
         """Get HTTP headers for MCP Server requests."""
         headers = {
             "Content-Type": "application/json",
-            "User-Agent": f"{settings.app_name}/{settings.app_version}"
+            "User-Agent": _user_agent()
         }
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
@@ -111,86 +117,61 @@ class GoogleCloudConfig:
 class APIConfigManager:
     """Centralized API configuration manager."""
     
-    def __init__(self):
-        self._openai_config = None
-        self._github_config = None
-        self._github_mcp_config = None
-        self._google_cloud_config = None
-    
-    @property
+    @cached_property
     def openai(self) -> OpenAIConfig:
         """Get OpenAI configuration."""
-        if self._openai_config is None:
-            self._openai_config = OpenAIConfig(
-                api_key=settings.openai_api_key,
-                requests_per_minute=settings.openai_requests_per_minute
-            )
-        return self._openai_config
+        settings = get_settings()
+        return OpenAIConfig(
+            api_key=settings.openai_api_key,
+            requests_per_minute=settings.openai_requests_per_minute
+        )
     
-    @property
+    @cached_property
     def github(self) -> GitHubConfig:
         """Get GitHub configuration."""
-        if self._github_config is None:
-            self._github_config = GitHubConfig(
-                token=settings.github_personal_access_token,
-                requests_per_hour=settings.github_requests_per_hour
-            )
-        return self._github_config
+        settings = get_settings()
+        return GitHubConfig(
+            token=settings.github_personal_access_token,
+            requests_per_hour=settings.github_requests_per_hour
+        )
     
-    @property
+    @cached_property
     def github_mcp(self) -> GitHubMCPConfig:
         """Get GitHub MCP Server configuration."""
-        if self._github_mcp_config is None:
-            self._github_mcp_config = GitHubMCPConfig(
-                server_url=settings.github_mcp_server_url,
-                token=settings.github_mcp_server_token
-            )
-        return self._github_mcp_config
+        settings = get_settings()
+        return GitHubMCPConfig(
+            server_url=settings.github_mcp_server_url,
+            token=settings.github_mcp_server_token
+        )
     
-    @property
+    @cached_property
     def google_cloud(self) -> GoogleCloudConfig:
         """Get Google Cloud configuration."""
-        if self._google_cloud_config is None:
-            self._google_cloud_config = GoogleCloudConfig(
-                project_id=settings.google_cloud_project,
-                credentials_path=settings.google_application_credentials
-            )
-        return self._google_cloud_config
+        settings = get_settings()
+        return GoogleCloudConfig(
+            project_id=settings.google_cloud_project,
+            credentials_path=settings.google_application_credentials
+        )
     
     def validate_configurations(self) -> Dict[str, bool]:
         """
         Validate all API configurations.
         
+        Reads the underlying settings directly so validation does not
+        construct the per-service config objects.
+        
         Returns:
             Dict mapping service names to validation status
         """
-        validations = {}
-        
-        # Validate OpenAI
-        try:
-            validations["openai"] = bool(self.openai.api_key)
-        except Exception:
-            validations["openai"] = False
-        
-        # Validate GitHub
-        try:
-            validations["github"] = bool(self.github.token)
-        except Exception:
-            validations["github"] = False
-        
-        # Validate GitHub MCP
-        try:
-            validations["github_mcp"] = bool(self.github_mcp.server_url)
-        except Exception:
-            validations["github_mcp"] = False
-        
-        # Validate Google Cloud
-        try:
-            validations["google_cloud"] = self.google_cloud.is_configured
-        except Exception:
-            validations["google_cloud"] = False
-        
-        return validations
+        settings = get_settings()
+        return {
+            "openai": bool(settings.openai_api_key),
+            "github": bool(settings.github_personal_access_token),
+            "github_mcp": bool(settings.github_mcp_server_url),
+            "google_cloud": bool(
+                settings.google_cloud_project and settings.google_application_credentials
+            )
+        }
 
 
 # Global API configuration manager
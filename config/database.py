@@ -5,44 +5,99 @@ Handles SQLite connections, session management, and database initialization.
 """
 
 from contextlib import contextmanager
-from typing import Generator
+from functools import lru_cache
+from typing import Any, Generator, Iterator, Optional
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy import text
 
 
 from config.settings import get_settings
+from config.logging_config import get_logger
 
-settings = get_settings()
+logger = get_logger(__name__)
 
 # SQLite-specific configuration for better performance
 def _sqlite_pragma_on_connect(dbapi_con, connection_record):
     """Configure SQLite pragmas for better performance and reliability."""
-    dbapi_con.execute("PRAGMA foreign_keys=ON")
-    dbapi_con.execute("PRAGMA journal_mode=WAL")
-    dbapi_con.execute("PRAGMA synchronous=NORMAL")
-    dbapi_con.execute("PRAGMA temp_store=memory")
-    dbapi_con.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor = dbapi_con.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=memory")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB (negative value = KiB)
+    cursor.execute("PRAGMA wal_autocheckpoint=1000")
+    cursor.execute("PRAGMA analysis_limit=400")
+    cursor.execute("PRAGMA optimize=0x10002")  # Refresh planner stats if stale
+    cursor.close()
+
+def _sqlite_disable_implicit_begin(dbapi_con, connection_record):
+    """
+    Stop pysqlite from managing transactions itself.
+    
+    pysqlite defers BEGIN until the first write, so a SAVEPOINT opened after
+    only reads becomes the outermost transaction and its RELEASE commits.
+    With isolation_level=None, BEGIN is emitted by _sqlite_emit_begin instead.
+    """
+    dbapi_con.isolation_level = None
+
+def _sqlite_emit_begin(conn):
+    """Start the real SQLite transaction when SQLAlchemy begins one."""
+    conn.exec_driver_sql("BEGIN")
+
+def configure_sqlite_engine(sync_engine: Engine) -> None:
+    """Attach the SQLite connection pragmas and explicit BEGIN handling to an engine."""
+    if sync_engine.dialect.name != "sqlite":
+        return
+    event.listen(sync_engine, "connect", _sqlite_disable_implicit_begin)
+    event.listen(sync_engine, "connect", _sqlite_pragma_on_connect)
+    event.listen(sync_engine, "begin", _sqlite_emit_begin)
+
+def _pool_options(database_url: str, queue_pool=QueuePool) -> dict:
+    """
+    Select the connection pool for the configured database.
+    
+    File-backed databases get a QueuePool sized from settings so concurrent
+    readers can work against the WAL file in parallel. An in-memory SQLite
+    database only exists inside a single connection, so it keeps StaticPool.
+    """
+    if database_url.startswith("sqlite") and ":memory:" in database_url:
+        return {"poolclass": StaticPool}
+    
+    settings = get_settings()
+    return {
+        "poolclass": queue_pool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_timeout": 30
+    }
+
+
+# Rows per INSERT statement when batched inserts (create_many) are split up
+INSERT_PAGE_SIZE = 1000
 
 # Create database engine
+_settings = get_settings()
 engine = create_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    poolclass=StaticPool,
+    _settings.database_url,
+    echo=_settings.database_echo,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    insertmanyvalues_page_size=INSERT_PAGE_SIZE,
     connect_args={
         "check_same_thread": False,  # Allow SQLite to be used across threads
         "timeout": 30
-    }
+    },
+    **_pool_options(_settings.database_url)
 )
 
-# Add SQLite pragma configuration
-event.listen(engine, "connect", _sqlite_pragma_on_connect)
+# Add SQLite pragma and transaction configuration
+configure_sqlite_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -54,6 +109,9 @@ SessionLocal = sessionmaker(
 # Base class for all database models
 Base = declarative_base()
 
+# Liveness query shared by connection checks
+_PING_STATEMENT = text("SELECT 1")
+
 
 def get_database_engine() -> Engine:
     """Get the database engine instance."""
@@ -65,6 +123,34 @@ def get_session_factory() -> sessionmaker:
     return SessionLocal
 
 
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> "async_sessionmaker":
+    """
+    Get the async session factory, creating its engine on first use.
+    
+    The async engine talks to the same database through the aiosqlite
+    driver, which is only imported when async sessions are requested.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    
+    database_url = _settings.database_url
+    if database_url.startswith("sqlite://"):
+        database_url = database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    
+    async_engine = create_async_engine(
+        database_url,
+        echo=_settings.database_echo,
+        pool_pre_ping=True,
+        insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+        connect_args={"timeout": 30},
+        **_pool_options(database_url, queue_pool=AsyncAdaptedQueuePool)
+    )
+    configure_sqlite_engine(async_engine.sync_engine)
+    
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
     """
@@ -102,10 +188,10 @@ def init_database() -> None:
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
-        print("Database initialized successfully")
+        logger.info("Database initialized successfully")
         
-    except Exception as e:
-        print(f"Failed to initialize database: {e}")
+    except Exception:
+        logger.exception("Failed to initialize database")
         raise
 
 
@@ -117,11 +203,11 @@ def check_database_connection() -> bool:
         bool: True if connection is successful, False otherwise
     """
     try:
-        with get_db_session() as session:
-            session.execute(text("SELECT 1"))
+        with engine.connect() as connection:
+            connection.execute(_PING_STATEMENT)
         return True
     except Exception as e:
-        print(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         return False
 
 
@@ -140,11 +226,31 @@ class DatabaseManager:
         """Close all database sessions."""
         self.engine.dispose()
     
-    def execute_raw_sql(self, sql: str, params: dict = None) -> any:
-        """Execute raw SQL query."""
+    def execute_raw_sql(self, sql: str, params: Optional[dict] = None, *, stream: bool = False) -> any:
+        """
+        Execute raw SQL query.
+        
+        Args:
+            sql: SQL statement using :name placeholders for parameters
+            params: Values bound to the statement placeholders
+            stream: Return an iterator that fetches rows in batches instead
+                of materializing the full result
+        
+        Returns:
+            List of rows, or a row iterator when stream is True
+        """
+        if stream:
+            return self._iter_raw_sql(sql, params)
+        
+        with get_db_session() as session:
+            return session.execute(text(sql), params or {}).fetchall()
+    
+    def _iter_raw_sql(self, sql: str, params: Optional[dict] = None) -> Iterator[Any]:
+        """Yield rows of a raw SQL query, keeping the session open while iterating."""
         with get_db_session() as session:
-            result = session.execute(sql, params or {})
-            return result.fetchall()
+            result = session.execute(text(sql), params or {}).yield_per(1000)
+            for row in result:
+                yield row
 
 
 # Global database manager instance
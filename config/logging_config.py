@@ -4,15 +4,39 @@ Logging configuration for the Agentic AI Workflow.
 Provides structured logging with file rotation and different log levels.
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Dict, Optional
 
 from config.settings import get_settings
 
-settings = get_settings()
+# Logger name prefixes routed to the workflow log file
+WORKFLOW_LOGGER_PREFIXES = (
+    'src.workflow',
+    'src.agents',
+    'src.integrations'
+)
+
+# Third-party loggers capped at WARNING to keep the logs readable
+QUIET_THIRD_PARTY_LOGGERS = (
+    "openai",
+    "httpx",
+    "httpcore",
+    "urllib3",
+    "sqlalchemy",
+    "sqlalchemy.engine"
+)
+
+# Set once setup_logging() has installed the application handlers
+_LOGGING_CONFIGURED = False
+
+# Background listener draining queued records to the log files
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 class ColoredFormatter(logging.Formatter):
@@ -28,29 +52,48 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Pre-render colored level names once instead of per record
+        reset_color = self.COLORS['RESET']
+        self._colored_levelnames = {
+            level: f"{color}{level}{reset_color}"
+            for level, color in self.COLORS.items()
+            if level != 'RESET'
+        }
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
-        log_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        reset_color = self.COLORS['RESET']
-        
-        # Add color to level name
-        record.levelname = f"{log_color}{record.levelname}{reset_color}"
-        
-        return super().format(record)
+        levelname = record.levelname
+        record.levelname = self._colored_levelnames.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            # Restore so other handlers don't receive ANSI-escaped level names
+            record.levelname = levelname
 
 
 class StructuredFormatter(logging.Formatter):
     """Structured formatter for file logging."""
     
+    _EMPTY_CONTEXT = ""
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with structured information."""
-        # Add extra context
-        if hasattr(record, 'agent_type'):
-            record.context = f"[{record.agent_type}]"
-        elif hasattr(record, 'workflow_id'):
-            record.context = f"[Workflow:{record.workflow_id}]"
-        else:
-            record.context = ""
+        # The same record reaches several file handlers; compute context once
+        context = record.__dict__.get('_structured_context')
+        if context is None:
+            agent_type = getattr(record, 'agent_type', None)
+            if agent_type is not None:
+                context = f"[{agent_type}]"
+            else:
+                workflow_id = getattr(record, 'workflow_id', None)
+                if workflow_id is not None:
+                    context = f"[Workflow:{workflow_id}]"
+                else:
+                    context = self._EMPTY_CONTEXT
+            record._structured_context = context
+        record.context = context
         
         return super().format(record)
 
@@ -59,7 +102,16 @@ def setup_logging() -> None:
     """
     Set up comprehensive logging configuration.
     Creates console and file handlers with appropriate formatters.
+    File handlers run on a background QueueListener so logging calls
+    never block on disk writes.
+    Safe to call more than once; only the first call configures handlers.
     """
+    global _LOGGING_CONFIGURED, _queue_listener
+    if _LOGGING_CONFIGURED:
+        return
+    
+    settings = get_settings()
+    
     # Create logs directory
     logs_dir = settings.logs_dir
     
@@ -93,7 +145,6 @@ def setup_logging() -> None:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     app_handler.setFormatter(app_formatter)
-    root_logger.addHandler(app_handler)
     
     # Workflow-specific log file
     workflow_log_file = logs_dir / "workflow.log"
@@ -105,7 +156,6 @@ def setup_logging() -> None:
     workflow_handler.setLevel(logging.INFO)
     workflow_handler.addFilter(WorkflowLogFilter())
     workflow_handler.setFormatter(app_formatter)
-    root_logger.addHandler(workflow_handler)
     
     # Error log file for errors only
     error_log_file = logs_dir / "error.log"
@@ -116,13 +166,25 @@ def setup_logging() -> None:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(app_formatter)
-    root_logger.addHandler(error_handler)
+    
+    # Hand records to the file handlers through a queue
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        app_handler,
+        workflow_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
     
     # Configure third-party loggers
-    logging.getLogger("openai").setLevel(logging.WARNING)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+    for name in QUIET_THIRD_PARTY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    _LOGGING_CONFIGURED = True
 
 
 class WorkflowLogFilter(logging.Filter):
@@ -130,12 +192,7 @@ class WorkflowLogFilter(logging.Filter):
     
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter workflow-related messages."""
-        workflow_loggers = [
-            'src.workflow',
-            'src.agents',
-            'src.integrations'
-        ]
-        return any(record.name.startswith(logger) for logger in workflow_loggers)
+        return record.name.startswith(WORKFLOW_LOGGER_PREFIXES)
 
 
 def get_logger(name: str, **context) -> logging.Logger:
@@ -160,16 +217,22 @@ def get_logger(name: str, **context) -> logging.Logger:
 
 def log_function_call(func):
     """Decorator to log function calls with parameters and results."""
+    logger = get_logger(func.__module__)
+    func_name = func.__name__
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger = get_logger(func.__module__)
-        logger.debug(f"Calling {func.__name__} with args={args}, kwargs={kwargs}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("Calling %s with args=%r, kwargs=%r", func_name, args, kwargs)
         
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"{func.__name__} completed successfully")
+            if debug_enabled:
+                logger.debug("%s completed successfully", func_name)
             return result
         except Exception as e:
-            logger.error(f"{func.__name__} failed with error: {e}")
+            logger.error("%s failed with error: %s", func_name, e)
             raise
     
     return wrapper
@@ -178,26 +241,24 @@ def log_function_call(func):
 def log_agent_activity(agent_type: str, activity: str, **details):
     """Log agent-specific activities."""
     logger = get_logger('src.agents', agent_type=agent_type)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
-    detail_str = " | ".join([f"{k}={v}" for k, v in details.items()])
-    message = f"{activity}"
-    if detail_str:
-        message += f" | {detail_str}"
-    
-    logger.info(message)
+    if details:
+        detail_str = " | ".join(f"{k}={v}" for k, v in details.items())
+        logger.info("%s | %s", activity, detail_str)
+    else:
+        logger.info("%s", activity)
 
 
 def log_workflow_state(workflow_id: str, state: str, **details):
     """Log workflow state changes."""
     logger = get_logger('src.workflow', workflow_id=workflow_id)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
-    detail_str = " | ".join([f"{k}={v}" for k, v in details.items()])
-    message = f"State: {state}"
-    if detail_str:
-        message += f" | {detail_str}"
-    
-    logger.info(message)
-
-
-# Initialize logging when module is imported
-setup_logging()
+    if details:
+        detail_str = " | ".join(f"{k}={v}" for k, v in details.items())
+        logger.info("State: %s | %s", state, detail_str)
+    else:
+        logger.info("State: %s", state)
@@ -5,6 +5,7 @@ Handles environment variables, validation, and application settings.
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -36,7 +37,9 @@ class Settings(BaseSettings):
         default="sqlite:///data/database/agentic_workflow.db",
         env="DATABASE_URL"
     )
-    database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
+    database_pool_size: int = Field(default=25, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=25, env="DATABASE_MAX_OVERFLOW")
+    database_pool_recycle: int = Field(default=300, env="DATABASE_POOL_RECYCLE")
     database_echo: bool = Field(default=False, env="DATABASE_ECHO")
     
     # GitHub MCP Server Configuration
@@ -101,16 +104,16 @@ class Settings(BaseSettings):
         """Get the project root directory."""
         return Path(__file__).parent.parent.parent
     
-    @property
+    @cached_property
     def data_dir(self) -> Path:
-        """Get the data directory path."""
+        """Get the data directory path, creating it on first access."""
         data_dir = self.project_root / "data"
         data_dir.mkdir(exist_ok=True)
         return data_dir
     
-    @property
+    @cached_property
     def logs_dir(self) -> Path:
-        """Get the logs directory path."""
+        """Get the logs directory path, creating it on first access."""
         logs_dir = self.data_dir / "logs"
         logs_dir.mkdir(exist_ok=True)
         return logs_dir
@@ -121,10 +124,12 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the application settings instance."""
-    return settings
\ No newline at end of file
+    """
+    Get the application settings instance.
+    
+    Settings are parsed from the environment and .env file on first call
+    and the same instance is returned for the rest of the process.
+    """
+    return Settings()
@@ -6,18 +6,18 @@ Handles application initialization, CLI interface, and workflow execution.
 
 import sys
 import argparse
+import logging
+from functools import lru_cache
 from pathlib import Path
 
 # Add src directory to Python path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from config.settings import get_settings
-from config.database import init_database, check_database_connection
-from config.api_config import api_config
-from config.logging_config import get_logger, log_workflow_state
-
-logger = get_logger(__name__)
+# Config modules are imported where they are used: config.database builds
+# the SQLAlchemy engine and config.api_config reads settings on import,
+# neither of which --help needs.
+logger = logging.getLogger(__name__)
 
 
 def validate_environment() -> bool:
@@ -27,6 +27,9 @@ def validate_environment() -> bool:
     Returns:
         bool: True if environment is valid, False otherwise
     """
+    from config.database import check_database_connection
+    from config.api_config import api_config
+    
     logger.info("Validating environment configuration...")
     
     # Check database connection
@@ -39,7 +42,7 @@ def validate_environment() -> bool:
     
     failed_validations = [service for service, valid in validations.items() if not valid]
     if failed_validations:
-        logger.error(f"Failed API validations: {failed_validations}")
+        logger.error("Failed API validations: %s", failed_validations)
         return False
     
     logger.info("Environment validation successful")
@@ -53,6 +56,8 @@ def initialize_application() -> bool:
     Returns:
         bool: True if initialization successful, False otherwise
     """
+    from config.database import init_database
+    
     try:
         logger.info("Initializing Agentic AI Workflow application...")
         
@@ -69,12 +74,18 @@ def initialize_application() -> bool:
         return True
         
     except Exception as e:
-        logger.error(f"Application initialization failed: {e}")
+        logger.error("Application initialization failed: %s", e)
         return False
 
 
+@lru_cache(maxsize=1)
 def create_arg_parser() -> argparse.ArgumentParser:
-    """Create command line argument parser."""
+    """
+    Create command line argument parser.
+    
+    The parser is built once and reused when main() runs repeatedly in the
+    same process (tests, embedded workers).
+    """
     parser = argparse.ArgumentParser(
         description="Agentic AI Workflow - Multi-agent code analysis and improvement",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -153,8 +164,10 @@ def run_workflow(repository_url: str, branch: str = "main") -> bool:
     Returns:
         bool: True if workflow completed successfully
     """
+    from config.logging_config import log_workflow_state
+    
     try:
-        logger.info(f"Starting workflow for repository: {repository_url}")
+        logger.info("Starting workflow for repository: %s", repository_url)
         log_workflow_state("new_workflow", "initialized", 
                           repository_url=repository_url, branch=branch)
         
@@ -175,7 +188,7 @@ def run_workflow(repository_url: str, branch: str = "main") -> bool:
         return success
         
     except Exception as e:
-        logger.error(f"Workflow execution failed: {e}")
+        logger.error("Workflow execution failed: %s", e)
         log_workflow_state("new_workflow", "failed", error=str(e))
         return False
 
@@ -195,11 +208,14 @@ def run_interactive_mode() -> None:
     except KeyboardInterrupt:
         logger.info("Interactive mode interrupted by user")
     except Exception as e:
-        logger.error(f"Interactive mode failed: {e}")
+        logger.error("Interactive mode failed: %s", e)
 
 
 def display_config_info() -> None:
     """Display current configuration information."""
+    from config.settings import get_settings
+    from config.api_config import api_config
+    
     settings = get_settings()
     validations = api_config.validate_configurations()
     
@@ -236,12 +252,20 @@ def main() -> int:
     parser = create_arg_parser()
     args = parser.parse_args()
     
+    # Quick checks only need console warnings; skip the rotating file handlers
+    if args.validate_env or args.config_check:
+        logging.basicConfig(level=logging.WARNING)
+    else:
+        from config.logging_config import setup_logging
+        setup_logging()
+    
     # Handle special modes first
     if args.validate_env:
         success = validate_environment()
         return 0 if success else 1
     
     if args.init_db:
+        from config.database import init_database
         try:
             init_database()
             print("Database initialized successfully")
@@ -280,7 +304,7 @@ def main() -> int:
         logger.info("Application interrupted by user")
         return 0
     except Exception as e:
-        logger.error(f"Application failed with unexpected error: {e}")
+        logger.error("Application failed with unexpected error: %s", e)
         return 1
 
 
@@ -4,17 +4,27 @@ Database connection utilities and session management.
 Provides helper functions for database operations and connection handling.
 """
 
+import functools
+import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional, TypeVar, Generic
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, TypeVar, Generic
 
 from sqlalchemy.exc import SQLAlchemyError
+from tenacity import (
+    RetryCallState, Retrying, retry_if_exception_type,
+    stop_after_attempt, wait_exponential
+)
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 
-from config.database import get_db_session, SessionLocal
+from config.database import get_db_session, get_async_session_factory, SessionLocal
 from config.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 logger = get_logger(__name__)
 
 T = TypeVar('T')
@@ -38,36 +48,54 @@ class DatabaseConnection:
                 logger.info("Database connection test successful")
                 return True
         except Exception as e:
-            logger.error(f"Database connection test failed: {e}")
+            logger.error("Database connection test failed: %s", e)
             return False
     
     def execute_with_retry(self, operation, max_retries: int = 3) -> Optional[any]:
         """
         Execute database operation with retry logic.
         
+        SQLAlchemy errors are retried with exponential backoff; each attempt
+        runs in its own session, and pool_pre_ping discards dead connections
+        before they are handed out again.
+        
         Args:
             operation: Function to execute
             max_retries: Maximum number of retry attempts
             
         Returns:
-            Result of the operation or None if failed
+            Result of the operation
         """
-        for attempt in range(max_retries):
-            try:
-                with get_db_session() as session:
-                    result = operation(session)
-                    logger.debug(f"Database operation successful on attempt {attempt + 1}")
-                    return result
-            except SQLAlchemyError as e:
-                logger.warning(f"Database operation failed on attempt {attempt + 1}: {e}")
-                if attempt == max_retries - 1:
-                    logger.error(f"Database operation failed after {max_retries} attempts")
-                    raise
-            except Exception as e:
-                logger.error(f"Unexpected error in database operation: {e}")
-                raise
-        
-        return None
+        retrying = Retrying(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_exponential(multiplier=0.05),
+            retry=retry_if_exception_type(SQLAlchemyError),
+            before_sleep=_log_retry_attempt,
+            reraise=True
+        )
+        try:
+            return retrying(self._run_in_session, operation)
+        except SQLAlchemyError:
+            logger.error("Database operation failed after %d attempts", max_retries)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in database operation: %s", e)
+            raise
+    
+    @staticmethod
+    def _run_in_session(operation) -> any:
+        """Run a single attempt of an operation in a fresh session."""
+        with get_db_session() as session:
+            return operation(session)
+
+
+def _log_retry_attempt(retry_state: RetryCallState) -> None:
+    """Log a failed attempt before tenacity sleeps and retries."""
+    logger.warning(
+        "Database operation failed on attempt %d: %s",
+        retry_state.attempt_number,
+        retry_state.outcome.exception()
+    )
 
 
 class TransactionManager:
@@ -78,12 +106,17 @@ class TransactionManager:
         self.transaction = None
     
     def __enter__(self):
-        self.transaction = self.session.begin()
+        # Inside an active transaction use a SAVEPOINT on the same connection
+        # instead of failing or needing a second session
+        if self.session.in_transaction():
+            self.transaction = self.session.begin_nested()
+        else:
+            self.transaction = self.session.begin()
         return self.session
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is not None:
-            logger.error(f"Transaction failed, rolling back: {exc_val}")
+            logger.error("Transaction failed, rolling back: %s", exc_val)
             self.transaction.rollback()
         else:
             self.transaction.commit()
@@ -91,20 +124,24 @@ class TransactionManager:
 
 
 @asynccontextmanager
-async def get_async_db_session() -> AsyncGenerator[Session, None]:
+async def get_async_db_session() -> AsyncGenerator["AsyncSession", None]:
     """
     Async context manager for database sessions.
-    Note: This is a placeholder for future async implementation.
+    
+    Backed by an AsyncSession on the aiosqlite driver, so database I/O
+    does not block the event loop.
+    
+    Usage:
+        async with get_async_db_session() as session:
+            result = await session.execute(select(Model))
     """
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
+    async with get_async_session_factory()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
 
 
 def with_db_session(func):
@@ -117,6 +154,7 @@ def with_db_session(func):
             # Use session here
             pass
     """
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         with get_db_session() as session:
             return func(session, *args, **kwargs)
@@ -131,17 +169,26 @@ def safe_db_operation(operation_name: str = "database operation"):
         operation_name: Name of the operation for logging
     """
     def decorator(func):
+        debug_enabled = logger.isEnabledFor
+        log_debug = logger.debug
+        log_error = logger.error
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            # Checked per call: logging is configured after modules are imported
+            debug = debug_enabled(logging.DEBUG)
             try:
-                logger.debug(f"Starting {operation_name}")
+                if debug:
+                    log_debug("Starting %s", operation_name)
                 result = func(*args, **kwargs)
-                logger.debug(f"Completed {operation_name} successfully")
+                if debug:
+                    log_debug("Completed %s successfully", operation_name)
                 return result
             except SQLAlchemyError as e:
-                logger.error(f"{operation_name} failed with SQLAlchemy error: {e}")
+                log_error("%s failed with SQLAlchemy error: %s", operation_name, e)
                 raise
             except Exception as e:
-                logger.error(f"{operation_name} failed with unexpected error: {e}")
+                log_error("%s failed with unexpected error: %s", operation_name, e)
                 raise
         return wrapper
     return decorator
@@ -150,37 +197,78 @@ def safe_db_operation(operation_name: str = "database operation"):
 class ConnectionPool:
     """Database connection pool manager."""
     
-    def __init__(self):
+    def __init__(self, health_check_ttl: float = 5.0, stats_ttl: float = 1.0):
         self.db_connection = DatabaseConnection()
+        self.engine = self.db_connection.session_factory.kw["bind"]
         self._is_healthy = True
+        self._health_check_ttl = health_check_ttl
+        self._last_health_check = None
+        self._stats_ttl = stats_ttl
+        self._stats = None
+        self._stats_at = None
     
-    def health_check(self) -> bool:
-        """Perform health check on database connection."""
+    def health_check(self, force: bool = False) -> bool:
+        """
+        Perform health check on database connection.
+        
+        The result is reused for health_check_ttl seconds; the engine's
+        pool_pre_ping already validates connections on checkout, so
+        frequent polling does not need a round-trip every time.
+        
+        Args:
+            force: Run the check even if a recent result is cached
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_health_check is not None
+            and now - self._last_health_check < self._health_check_ttl
+        ):
+            return self._is_healthy
+        
         try:
             self._is_healthy = self.db_connection.test_connection()
-            return self._is_healthy
         except Exception as e:
-            logger.error(f"Connection pool health check failed: {e}")
+            logger.error("Connection pool health check failed: %s", e)
             self._is_healthy = False
-            return False
+        self._last_health_check = now
+        return self._is_healthy
     
     def get_connection_stats(self) -> dict:
-        """Get connection pool statistics."""
-        return {
-            "is_healthy": self._is_healthy,
-            "pool_size": self.db_connection.session_factory.kw.get("pool_size", "unknown"),
-            "checked_out": "unknown",  # SQLite doesn't provide this info
-            "overflow": "unknown",
-            "checked_in": "unknown"
+        """
+        Get connection pool statistics.
+        
+        Counters are read from the engine's pool and reused for stats_ttl
+        seconds; is_healthy is always current. Pools that don't track a
+        counter (e.g. StaticPool for in-memory SQLite) report it as
+        "unknown".
+        """
+        now = time.monotonic()
+        if self._stats is not None and now - self._stats_at < self._stats_ttl:
+            return {**self._stats, "is_healthy": self._is_healthy}
+        
+        pool = self.engine.pool
+        
+        def pool_counter(name: str):
+            counter = getattr(pool, name, None)
+            return counter() if callable(counter) else "unknown"
+        
+        self._stats = {
+            "pool_size": pool_counter("size"),
+            "checked_out": pool_counter("checkedout"),
+            "overflow": pool_counter("overflow"),
+            "checked_in": pool_counter("checkedin")
         }
+        self._stats_at = now
+        return {**self._stats, "is_healthy": self._is_healthy}
     
     def close_all_connections(self) -> None:
         """Close all connections in the pool."""
         try:
-            self.db_connection.session_factory.bind.dispose()
+            self.engine.dispose()
             logger.info("All database connections closed")
         except Exception as e:
-            logger.error(f"Error closing database connections: {e}")
+            logger.error("Error closing database connections: %s", e)
 
 
 # Global connection pool instance
@@ -55,6 +55,7 @@ CREATE INDEX IF NOT EXISTS idx_code_analyses_repository_id ON code_analyses(repo
 CREATE INDEX IF NOT EXISTS idx_code_analyses_file_path ON code_analyses(file_path);
 CREATE INDEX IF NOT EXISTS idx_code_analyses_status ON code_analyses(status);
 CREATE INDEX IF NOT EXISTS idx_code_analyses_language ON code_analyses(language);
+CREATE INDEX IF NOT EXISTS idx_code_analyses_repository_status ON code_analyses(repository_id, status);
 
 -- Suggestions table
 CREATE TABLE IF NOT EXISTS suggestions (
@@ -116,6 +117,7 @@ CREATE INDEX IF NOT EXISTS idx_workflow_states_repository_id ON workflow_states(
 CREATE INDEX IF NOT EXISTS idx_workflow_states_workflow_id ON workflow_states(workflow_id);
 CREATE INDEX IF NOT EXISTS idx_workflow_states_status ON workflow_states(status);
 CREATE INDEX IF NOT EXISTS idx_workflow_states_created_at ON workflow_states(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_workflow_states_repository_status ON workflow_states(repository_id, status);
 
 -- Create triggers for updating updated_at timestamps
 CREATE TRIGGER IF NOT EXISTS update_repositories_timestamp 
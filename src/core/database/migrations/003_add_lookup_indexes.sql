@@ -0,0 +1,12 @@
+/*src/core/database/migrations/003_add_lookup_indexes.sql*/
+-- Composite indexes backing the multi-column lookups in the repository layer
+
+-- Analysis lookup by repository and file (CodeAnalysisRepo.get_by_file_path)
+CREATE INDEX IF NOT EXISTS idx_code_analyses_repository_file_path ON code_analyses(repository_id, file_path);
+
+-- Suggestion filtering by type and status (SuggestionRepo.get_by_type, get_statistics)
+CREATE INDEX IF NOT EXISTS idx_suggestions_type_status ON suggestions(type, status);
+
+-- Recently analyzed repositories, in index order (RepositoryRepo.get_recently_analyzed)
+CREATE INDEX IF NOT EXISTS idx_repositories_last_analyzed_recent ON repositories(last_analyzed DESC)
+    WHERE last_analyzed IS NOT NULL;
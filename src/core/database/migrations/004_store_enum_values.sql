@@ -0,0 +1,11 @@
+/*src/core/database/migrations/004_store_enum_values.sql*/
+-- Enum columns store lowercase member values; rows written by the earlier
+-- SQLAlchemy Enum columns hold member names (e.g. 'COMPLETED'). Every value
+-- is its name in lowercase, so rewriting is a case fold. Safe to re-run.
+
+UPDATE code_analyses SET status = LOWER(status) WHERE status <> LOWER(status);
+
+UPDATE suggestions SET type = LOWER(type) WHERE type <> LOWER(type);
+UPDATE suggestions SET status = LOWER(status) WHERE status <> LOWER(status);
+
+UPDATE workflow_states SET status = LOWER(status) WHERE status <> LOWER(status);
@@ -0,0 +1,25 @@
+/*src/core/database/migrations/005_add_url_hash_and_workflow_errors.sql*/
+-- Compact repository URL lookups and append-only workflow error entries
+
+-- 64-bit BLAKE2b of url, set by the application; rows created earlier are
+-- backfilled by RepositoryRepo.get_by_url on their next lookup
+ALTER TABLE repositories ADD COLUMN url_hash BIGINT;
+CREATE INDEX IF NOT EXISTS idx_repositories_url_hash ON repositories(url_hash);
+
+-- repositories.url is already indexed by its UNIQUE constraint, and lookups by
+-- URL go through idx_repositories_url_hash; drop the redundant wide index
+DROP INDEX IF EXISTS idx_repositories_url;
+
+-- Workflow error entries (append-only, replaces the workflow_states.error_log blob)
+CREATE TABLE IF NOT EXISTS workflow_errors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_state_id INTEGER NOT NULL,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    type VARCHAR(50) DEFAULT 'general',
+    message TEXT NOT NULL,
+    agent VARCHAR(50),
+    step VARCHAR(100),
+    FOREIGN KEY (workflow_state_id) REFERENCES workflow_states(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_errors_workflow_state_id ON workflow_errors(workflow_state_id);
@@ -4,15 +4,17 @@ Database models for the Agentic AI Workflow.
 Defines SQLAlchemy models for repositories, analysis, suggestions, and workflow states.
 """
 
+import hashlib
+import time
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
 
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, JSON, 
-    ForeignKey, Float, Enum as SQLEnum
+    Column, Integer, BigInteger, String, Text, DateTime, Boolean, JSON, 
+    ForeignKey, Float, Index, TypeDecorator, event
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship, validates
 
 from config.database import Base
 
@@ -55,13 +57,57 @@ class WorkflowStatus(Enum):
     FAILED = "failed"
 
 
+def compute_url_hash(url: str) -> int:
+    """Compute the signed 64-bit hash used to index repository URLs."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class StringEnum(TypeDecorator):
+    """
+    Stores a Python Enum by its value in a plain VARCHAR column.
+    
+    Unlike SQLAlchemy's Enum type this persists the lowercase values used
+    by the SQL migrations, and converts with a prebuilt dict lookup.
+    Loaded values are the enum's own member singletons, so status checks
+    can compare with `is`.
+    """
+    
+    impl = String
+    cache_ok = True
+    
+    def __init__(self, enum_class):
+        self.enum_class = enum_class
+        # Rows written through SQLAlchemy's Enum type hold member names
+        # (migration 004 rewrites them), so names resolve as well as values
+        self._members = {member.name: member for member in enum_class}
+        self._members.update((member.value, member) for member in enum_class)
+        super().__init__(length=max(len(member.value) for member in enum_class))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, self.enum_class):
+            return value.value
+        return self.enum_class(value).value
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
+
+
 class Repository(Base):
     """Repository model for storing GitHub repository information."""
     
     __tablename__ = "repositories"
+    __table_args__ = (
+        Index("idx_repositories_owner_name", "owner", "name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    url = Column(String(500), unique=True, index=True, nullable=False)
+    url = Column(String(500), unique=True, nullable=False)
+    url_hash = Column(BigInteger, index=True)  # Compact lookup key for url
     name = Column(String(100), nullable=False)
     owner = Column(String(100), nullable=False)
     branch = Column(String(50), default="main")
@@ -80,39 +126,58 @@ class Repository(Base):
     last_analyzed = Column(DateTime)
     
     # Relationships
-    analyses = relationship("CodeAnalysis", back_populates="repository", cascade="all, delete-orphan")
-    workflow_states = relationship("WorkflowState", back_populates="repository", cascade="all, delete-orphan")
+    analyses = relationship("CodeAnalysis", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True)
+    workflow_states = relationship("WorkflowState", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True)
+    
+    @validates("url")
+    def _set_url_hash(self, key: str, value: str) -> str:
+        """Keep url_hash in sync whenever the URL is assigned."""
+        self.url_hash = compute_url_hash(value) if value is not None else None
+        return value
     
     def __repr__(self) -> str:
         return f"<Repository(id={self.id}, name='{self.name}', owner='{self.owner}')>"
 
 
+# Partial index in recency order for get_recently_analyzed
+Index(
+    "idx_repositories_last_analyzed_recent",
+    Repository.last_analyzed.desc(),
+    postgresql_where=Repository.last_analyzed.isnot(None),
+    sqlite_where=Repository.last_analyzed.isnot(None)
+)
+
+
 class CodeAnalysis(Base):
     """Code analysis results for repository files."""
     
     __tablename__ = "code_analyses"
+    __table_args__ = (
+        Index("idx_code_analyses_repository_status", "repository_id", "status"),
+        Index("idx_code_analyses_repository_file_path", "repository_id", "file_path"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
+    repository_id = Column(Integer, ForeignKey("repositories.id", ondelete="CASCADE"), nullable=False)
     file_path = Column(String(500), nullable=False)
     
     # Analysis results
-    status = Column(SQLEnum(AnalysisStatus), default=AnalysisStatus.PENDING)
+    status = Column(StringEnum(AnalysisStatus), default=AnalysisStatus.PENDING)
     language = Column(String(50))
     lines_of_code = Column(Integer)
     complexity_score = Column(Float)
     quality_score = Column(Float)
     
-    # Extracted code elements
-    functions = Column(JSON)  # List of function definitions
-    classes = Column(JSON)    # List of class definitions
-    imports = Column(JSON)    # List of imports/dependencies
-    comments = Column(JSON)   # List of comments and docstrings
+    # Extracted code elements (deferred: loaded together on first access)
+    functions = deferred(Column(JSON), group="artifacts")  # List of function definitions
+    classes = deferred(Column(JSON), group="artifacts")    # List of class definitions
+    imports = deferred(Column(JSON), group="artifacts")    # List of imports/dependencies
+    comments = deferred(Column(JSON), group="artifacts")   # List of comments and docstrings
     
     # Analysis summary
     summary = Column(Text)
-    issues_found = Column(JSON)  # List of detected issues
-    dependencies = Column(JSON)  # File dependencies
+    issues_found = deferred(Column(JSON), group="artifacts")  # List of detected issues
+    dependencies = deferred(Column(JSON), group="artifacts")  # File dependencies
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -120,7 +185,7 @@ class CodeAnalysis(Base):
     
     # Relationships
     repository = relationship("Repository", back_populates="analyses")
-    suggestions = relationship("Suggestion", back_populates="analysis", cascade="all, delete-orphan")
+    suggestions = relationship("Suggestion", back_populates="analysis", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<CodeAnalysis(id={self.id}, file_path='{self.file_path}', status='{self.status}')>"
@@ -130,13 +195,16 @@ class Suggestion(Base):
     """Code improvement suggestions generated by agents."""
     
     __tablename__ = "suggestions"
+    __table_args__ = (
+        Index("idx_suggestions_type_status", "type", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    analysis_id = Column(Integer, ForeignKey("code_analyses.id"), nullable=False)
+    analysis_id = Column(Integer, ForeignKey("code_analyses.id", ondelete="CASCADE"), nullable=False)
     
     # Suggestion details
-    type = Column(SQLEnum(SuggestionType), nullable=False)
-    status = Column(SQLEnum(SuggestionStatus), default=SuggestionStatus.GENERATED)
+    type = Column(StringEnum(SuggestionType), nullable=False)
+    status = Column(StringEnum(SuggestionStatus), default=SuggestionStatus.GENERATED)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
     
@@ -167,17 +235,29 @@ class Suggestion(Base):
         return f"<Suggestion(id={self.id}, type='{self.type}', status='{self.status}')>"
 
 
+# Confidence-ordered index for get_high_confidence; partial where supported
+Index(
+    "idx_suggestions_confidence_high",
+    Suggestion.confidence_score.desc(),
+    postgresql_where=Suggestion.confidence_score >= 0.5
+)
+
+
 class WorkflowState(Base):
     """Workflow execution state and progress tracking."""
     
     __tablename__ = "workflow_states"
+    __table_args__ = (
+        Index("idx_workflow_states_repository_status", "repository_id", "status"),
+        Index("idx_workflow_states_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
+    repository_id = Column(Integer, ForeignKey("repositories.id", ondelete="CASCADE"), nullable=False)
     
     # Workflow identification
     workflow_id = Column(String(50), unique=True, index=True, nullable=False)
-    status = Column(SQLEnum(WorkflowStatus), default=WorkflowStatus.INITIALIZED)
+    status = Column(StringEnum(WorkflowStatus), default=WorkflowStatus.INITIALIZED)
     
     # Progress tracking
     current_agent = Column(String(50))
@@ -197,7 +277,7 @@ class WorkflowState(Base):
     # Configuration and context
     agent_config = Column(JSON)       # Agent configuration used
     context_data = Column(JSON)       # Workflow context and state
-    error_log = Column(JSON)          # Error messages and stack traces
+    error_log = Column(JSON)          # Legacy error blob; new errors go to workflow_errors
     
     # GitHub integration
     branch_name = Column(String(100)) # Created branch for suggestions
@@ -209,6 +289,13 @@ class WorkflowState(Base):
     
     # Relationships
     repository = relationship("Repository", back_populates="workflow_states")
+    errors = relationship(
+        "WorkflowError", back_populates="workflow", lazy="dynamic",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    
+    # Wall-clock time (ns) of the last unflushed progress update; not mapped
+    _progress_updated_ns = None
     
     def __repr__(self) -> str:
         return f"<WorkflowState(id={self.id}, workflow_id='{self.workflow_id}', status='{self.status}')>"
@@ -219,7 +306,8 @@ class WorkflowState(Base):
         self.current_step = step
         if agent:
             self.current_agent = agent
-        self.updated_at = datetime.utcnow()
+        # Materialized into updated_at on flush (see _apply_progress_timestamps)
+        self._progress_updated_ns = time.time_ns()
     
     def mark_completed(self, success: bool = True) -> None:
         """Mark workflow as completed."""
@@ -230,15 +318,42 @@ class WorkflowState(Base):
             self.execution_time_seconds = (self.end_time - self.start_time).total_seconds()
     
     def add_error(self, error_message: str, error_type: str = "general") -> None:
-        """Add error to workflow state."""
-        if not self.error_log:
-            self.error_log = []
-        
-        error_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "type": error_type,
-            "message": error_message,
-            "agent": self.current_agent,
-            "step": self.current_step
-        }
-        self.error_log.append(error_entry)
+        """Add error to workflow state (one INSERT into workflow_errors)."""
+        self.errors.append(WorkflowError(
+            timestamp=datetime.utcnow(),
+            type=error_type,
+            message=error_message,
+            agent=self.current_agent,
+            step=self.current_step
+        ))
+
+
+class WorkflowError(Base):
+    """Append-only error entries recorded against a workflow."""
+    
+    __tablename__ = "workflow_errors"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    workflow_state_id = Column(Integer, ForeignKey("workflow_states.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Error details
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    type = Column(String(50), default="general")
+    message = Column(Text, nullable=False)
+    agent = Column(String(50))        # Agent active when the error occurred
+    step = Column(String(100))        # Workflow step active when the error occurred
+    
+    # Relationships
+    workflow = relationship("WorkflowState", back_populates="errors")
+    
+    def __repr__(self) -> str:
+        return f"<WorkflowError(id={self.id}, type='{self.type}', workflow_state_id={self.workflow_state_id})>"
+
+
+@event.listens_for(WorkflowState, "before_insert")
+@event.listens_for(WorkflowState, "before_update")
+def _apply_progress_timestamps(mapper, connection, target: WorkflowState) -> None:
+    """Convert a pending WorkflowState progress tick into updated_at on flush."""
+    if target._progress_updated_ns is not None:
+        target.updated_at = datetime.utcfromtimestamp(target._progress_updated_ns / 1e9)
+        target._progress_updated_ns = None
@@ -4,21 +4,37 @@ Data access layer for database operations.
 Provides repository pattern implementation for all database models.
 """
 
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import func, desc, and_, or_, delete, insert, select, update, bindparam
+from sqlalchemy.engine import Row
 
 from src.core.database.models import (
     Repository, CodeAnalysis, Suggestion, WorkflowState,
-    AnalysisStatus, SuggestionStatus, WorkflowStatus, SuggestionType
+    AnalysisStatus, SuggestionStatus, WorkflowStatus, SuggestionType,
+    compute_url_hash
 )
 from config.database import get_db_session
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Rows fetched per batch by the streaming queries
+STREAM_BATCH_SIZE = 500
+
+# Workflow statuses that mean the workflow is still running
+ACTIVE_WORKFLOW_STATUSES = (
+    WorkflowStatus.INITIALIZED,
+    WorkflowStatus.CLONING_REPO,
+    WorkflowStatus.ANALYZING_CODE,
+    WorkflowStatus.GENERATING_SUGGESTIONS,
+    WorkflowStatus.TESTING_SUGGESTIONS,
+    WorkflowStatus.CREATING_PR
+)
 
 class BaseRepository:
     """Base repository with common CRUD operations."""
@@ -30,15 +46,38 @@ class BaseRepository:
         """Create a new record."""
         obj = self.model_class(**kwargs)
         session.add(obj)
-        session.flush()
-        session.refresh(obj)
+        session.flush()  # Assigns the primary key; all defaults are client-side
         return obj
     
+    def create_many(self, session: Session, rows: List[Dict[str, Any]], return_ids: bool = True) -> Optional[List[int]]:
+        """
+        Insert many records in a single batched statement.
+        
+        Rows are plain column dicts and skip ORM construction, so model
+        validators and events do not run for them.
+        
+        Args:
+            session: Database session
+            rows: Column values for each new record
+            return_ids: Whether to return the new primary keys
+            
+        Returns:
+            New primary keys in row order, or None if return_ids is False
+        """
+        if not rows:
+            return [] if return_ids else None
+        
+        dialect = session.get_bind().dialect
+        if return_ids and dialect.insert_executemany_returning:
+            statement = insert(self.model_class).returning(self.model_class.id, sort_by_parameter_order=True)
+            return list(session.scalars(statement, rows))
+        
+        session.bulk_insert_mappings(self.model_class, rows, return_defaults=return_ids)
+        return [row["id"] for row in rows] if return_ids else None
+    
     def get_by_id(self, session: Session, obj_id: int) -> Optional[any]:
-        """Get record by ID."""
-        return session.query(self.model_class).filter(
-            self.model_class.id == obj_id
-        ).first()
+        """Get record by ID (served from the identity map when already loaded)."""
+        return session.get(self.model_class, obj_id)
     
     def get_all(self, session: Session, limit: int = 100, offset: int = 0) -> List[any]:
         """Get all records with pagination."""
@@ -46,27 +85,52 @@ class BaseRepository:
     
     def update(self, session: Session, obj_id: int, **kwargs) -> Optional[any]:
         """Update record by ID."""
-        obj = self.get_by_id(session, obj_id)
+        kwargs["updated_at"] = datetime.utcnow()
+        return self._update_returning(session, self.model_class.id == obj_id, kwargs)
+    
+    def _update_returning(self, session: Session, criterion, values: Dict[str, Any]) -> Optional[any]:
+        """
+        Apply values to the single row matching criterion and return it.
+        
+        Uses one UPDATE ... RETURNING round-trip where the dialect supports
+        it; "fetch" synchronization applies the new values to any copy
+        already in the identity map using the returned rows.
+        Other dialects fall back to loading the row and flushing changes.
+        """
+        if session.get_bind().dialect.update_returning:
+            session.flush()  # Pending edits would otherwise be overwritten below
+            statement = (
+                update(self.model_class)
+                .where(criterion)
+                .values(**values)
+                .returning(self.model_class)
+                .execution_options(synchronize_session="fetch")
+            )
+            return session.execute(statement).scalars().first()
+        
+        obj = session.query(self.model_class).filter(criterion).first()
         if obj:
-            for key, value in kwargs.items():
+            for key, value in values.items():
                 setattr(obj, key, value)
-            obj.updated_at = datetime.utcnow()
             session.flush()
-            session.refresh(obj)
         return obj
     
     def delete(self, session: Session, obj_id: int) -> bool:
-        """Delete record by ID."""
-        obj = self.get_by_id(session, obj_id)
-        if obj:
-            session.delete(obj)
-            session.commit()
-            return True
-        return False
+        """
+        Delete record by ID.
+        
+        Issues a single DELETE without loading the row; dependent rows are
+        removed by the database's ON DELETE CASCADE foreign keys.
+        """
+        result = session.execute(
+            delete(self.model_class).where(self.model_class.id == obj_id)
+        )
+        session.commit()
+        return result.rowcount > 0
     
     def count(self, session: Session) -> int:
         """Count total records."""
-        return session.query(func.count(self.model_class.id)).scalar()
+        return session.scalar(select(func.count()).select_from(self.model_class))
 
 
 class RepositoryRepo(BaseRepository):
@@ -77,7 +141,35 @@ class RepositoryRepo(BaseRepository):
     
     def get_by_url(self, session: Session, url: str) -> Optional[Repository]:
         """Get repository by URL."""
-        return session.query(Repository).filter(Repository.url == url).first()
+        # The hash narrows the lookup through its compact index; url confirms the match
+        url_hash = compute_url_hash(url)
+        repo = session.query(Repository).filter(
+            Repository.url_hash == url_hash,
+            Repository.url == url
+        ).first()
+        if repo is None:
+            # Rows created before migration 005 have no url_hash yet; find them
+            # by url and backfill the hash so the next lookup takes the fast path
+            repo = session.query(Repository).filter(
+                Repository.url_hash.is_(None),
+                Repository.url == url
+            ).first()
+            if repo is not None:
+                repo.url_hash = url_hash
+        return repo
+    
+    def create_many(self, session: Session, rows: List[Dict[str, Any]], return_ids: bool = True) -> Optional[List[int]]:
+        """Insert many repositories in one statement, filling in url_hash for each."""
+        # Core inserts bypass the @validates('url') hook on the model
+        rows = [{**row, "url_hash": compute_url_hash(row["url"])} for row in rows]
+        return super().create_many(session, rows, return_ids=return_ids)
+    
+    def update(self, session: Session, obj_id: int, **kwargs) -> Optional[Repository]:
+        """Update repository by ID, keeping url_hash in sync with url."""
+        # UPDATE statements bypass the @validates('url') hook on the model
+        if kwargs.get("url") is not None:
+            kwargs["url_hash"] = compute_url_hash(kwargs["url"])
+        return super().update(session, obj_id, **kwargs)
     
     def get_by_owner_name(self, session: Session, owner: str, name: str) -> Optional[Repository]:
         """Get repository by owner and name."""
@@ -116,6 +208,24 @@ class CodeAnalysisRepo(BaseRepository):
             query = query.filter(CodeAnalysis.status == status)
         return query.all()
     
+    def list_files(self, session: Session, repo_id: int, status: AnalysisStatus = None) -> List[Row]:
+        """
+        List analyzed files for a repository without loading full analyses.
+        
+        Returns rows of (id, file_path, status, language, lines_of_code);
+        summaries and the deferred JSON artifacts are never selected.
+        """
+        statement = select(
+            CodeAnalysis.id,
+            CodeAnalysis.file_path,
+            CodeAnalysis.status,
+            CodeAnalysis.language,
+            CodeAnalysis.lines_of_code
+        ).where(CodeAnalysis.repository_id == repo_id)
+        if status:
+            statement = statement.where(CodeAnalysis.status == status)
+        return session.execute(statement.order_by(CodeAnalysis.file_path)).all()
+    
     def get_by_file_path(self, session: Session, repo_id: int, file_path: str) -> Optional[CodeAnalysis]:
         """Get analysis for specific file in repository."""
         return session.query(CodeAnalysis).filter(
@@ -125,11 +235,18 @@ class CodeAnalysisRepo(BaseRepository):
             )
         ).first()
     
-    def get_failed_analyses(self, session: Session) -> List[CodeAnalysis]:
-        """Get all failed analyses for retry."""
-        return session.query(CodeAnalysis).filter(
-            CodeAnalysis.status == AnalysisStatus.FAILED
-        ).all()
+    def get_failed_analyses(self, session: Session) -> Iterator[CodeAnalysis]:
+        """
+        Stream all failed analyses for retry.
+        
+        Rows are fetched in batches of STREAM_BATCH_SIZE; consume the
+        iterator before the session closes.
+        """
+        return session.scalars(
+            select(CodeAnalysis)
+            .where(CodeAnalysis.status == AnalysisStatus.FAILED)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
     
     def update_status(self, session: Session, analysis_id: int, status: AnalysisStatus) -> Optional[CodeAnalysis]:
         """Update analysis status."""
@@ -137,55 +254,115 @@ class CodeAnalysisRepo(BaseRepository):
     
     def get_summary_stats(self, session: Session, repo_id: int) -> Dict[str, Any]:
         """Get analysis summary statistics for repository."""
-        stats = session.query(
+        # Per-status partial sums; window totals over them give repository-wide
+        # figures (averages weighted by scored rows) on every row of one query
+        by_status = select(
             CodeAnalysis.status,
             func.count(CodeAnalysis.id).label('count'),
-            func.avg(CodeAnalysis.complexity_score).label('avg_complexity'),
-            func.avg(CodeAnalysis.quality_score).label('avg_quality')
-        ).filter(
+            func.sum(CodeAnalysis.complexity_score).label('complexity_sum'),
+            func.count(CodeAnalysis.complexity_score).label('complexity_count'),
+            func.sum(CodeAnalysis.quality_score).label('quality_sum'),
+            func.count(CodeAnalysis.quality_score).label('quality_count')
+        ).where(
             CodeAnalysis.repository_id == repo_id
-        ).group_by(CodeAnalysis.status).all()
+        ).group_by(CodeAnalysis.status).cte('by_status')
         
+        stats = session.execute(select(
+            by_status.c.status,
+            by_status.c.count,
+            func.sum(by_status.c.count).over().label('total_files'),
+            (func.sum(by_status.c.complexity_sum).over()
+             / func.nullif(func.sum(by_status.c.complexity_count).over(), 0)).label('avg_complexity'),
+            (func.sum(by_status.c.quality_sum).over()
+             / func.nullif(func.sum(by_status.c.quality_count).over(), 0)).label('avg_quality')
+        )).all()
+        
+        totals = stats[0] if stats else None
         return {
-            'total_files': sum(stat.count for stat in stats),
+            'total_files': totals.total_files if totals else 0,
             'by_status': {stat.status.value: stat.count for stat in stats},
-            'avg_complexity': sum(stat.avg_complexity or 0 for stat in stats) / len(stats) if stats else 0,
-            'avg_quality': sum(stat.avg_quality or 0 for stat in stats) / len(stats) if stats else 0
+            'avg_complexity': float(totals.avg_complexity or 0) if totals else 0,
+            'avg_quality': float(totals.avg_quality or 0) if totals else 0
         }
 
 
 class SuggestionRepo(BaseRepository):
     """Repository operations for code suggestions."""
     
+    # Load analysis and repository up front (one query per path) and make any
+    # other lazy relationship access fail loudly instead of issuing N+1 SELECTs
+    _load_options = (
+        selectinload(Suggestion.analysis).selectinload(CodeAnalysis.repository),
+        raiseload("*"),
+    )
+    
     def __init__(self):
         super().__init__(Suggestion)
     
     def get_by_analysis(self, session: Session, analysis_id: int, status: SuggestionStatus = None) -> List[Suggestion]:
         """Get suggestions for a code analysis."""
-        query = session.query(Suggestion).filter(Suggestion.analysis_id == analysis_id)
+        query = session.query(Suggestion).options(*self._load_options).filter(
+            Suggestion.analysis_id == analysis_id
+        )
         if status:
             query = query.filter(Suggestion.status == status)
         return query.order_by(desc(Suggestion.confidence_score)).all()
     
     def get_by_repository(self, session: Session, repo_id: int) -> List[Suggestion]:
         """Get all suggestions for a repository."""
-        return session.query(Suggestion).join(CodeAnalysis).filter(
+        return session.query(Suggestion).join(CodeAnalysis).options(*self._load_options).filter(
             CodeAnalysis.repository_id == repo_id
         ).order_by(desc(Suggestion.created_at)).all()
     
+    def list_summaries(self, session: Session, repo_id: int) -> List[Row]:
+        """
+        List suggestion summaries for a repository without loading full rows.
+        
+        Returns rows of (id, status, confidence_score, created_at), newest
+        first; code and description text columns are never selected.
+        """
+        return session.execute(
+            select(
+                Suggestion.id,
+                Suggestion.status,
+                Suggestion.confidence_score,
+                Suggestion.created_at
+            ).join(CodeAnalysis).where(
+                CodeAnalysis.repository_id == repo_id
+            ).order_by(desc(Suggestion.created_at))
+        ).all()
+    
+    def count_by_repository(self, session: Session, repo_id: int) -> int:
+        """Count suggestions for a repository without loading them."""
+        return session.scalar(
+            select(func.count()).select_from(Suggestion).join(CodeAnalysis).where(
+                CodeAnalysis.repository_id == repo_id
+            )
+        )
+    
     def get_by_type(self, session: Session, suggestion_type: SuggestionType, status: SuggestionStatus = None) -> List[Suggestion]:
         """Get suggestions by type."""
-        query = session.query(Suggestion).filter(Suggestion.type == suggestion_type)
+        query = session.query(Suggestion).options(*self._load_options).filter(
+            Suggestion.type == suggestion_type
+        )
         if status:
             query = query.filter(Suggestion.status == status)
         return query.order_by(desc(Suggestion.confidence_score)).all()
     
     def get_high_confidence(self, session: Session, min_confidence: float = 0.8) -> List[Suggestion]:
         """Get high-confidence suggestions."""
-        return session.query(Suggestion).filter(
+        return session.query(Suggestion).options(*self._load_options).filter(
             Suggestion.confidence_score >= min_confidence
         ).order_by(desc(Suggestion.confidence_score)).all()
     
+    def count_high_confidence(self, session: Session, min_confidence: float = 0.8) -> int:
+        """Count high-confidence suggestions without loading them."""
+        return session.scalar(
+            select(func.count()).select_from(Suggestion).where(
+                Suggestion.confidence_score >= min_confidence
+            )
+        )
+    
     def update_status(self, session: Session, suggestion_id: int, status: SuggestionStatus, feedback: str = None) -> Optional[Suggestion]:
         """Update suggestion status with optional feedback."""
         update_data = {"status": status, "reviewed_at": datetime.utcnow()}
@@ -193,6 +370,37 @@ class SuggestionRepo(BaseRepository):
             update_data["feedback"] = feedback
         return self.update(session, suggestion_id, **update_data)
     
+    def update_status_many(self, session: Session, suggestion_ids: List[int], status: SuggestionStatus, feedback: str = None) -> int:
+        """
+        Update the status of many suggestions with a single UPDATE.
+        
+        Loaded Suggestion objects are not synchronized; expire them (or the
+        session) afterwards if they are still in use.
+        
+        Args:
+            session: Database session
+            suggestion_ids: IDs of suggestions to update
+            status: New status for all of them
+            feedback: Optional feedback applied to all of them
+            
+        Returns:
+            Number of suggestions updated
+        """
+        if not suggestion_ids:
+            return 0
+        
+        now = datetime.utcnow()
+        update_data = {"status": status, "reviewed_at": now, "updated_at": now}
+        if feedback:
+            update_data["feedback"] = feedback
+        result = session.execute(
+            update(Suggestion)
+            .where(Suggestion.id.in_(suggestion_ids))
+            .values(**update_data)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
     def get_statistics(self, session: Session) -> Dict[str, Any]:
         """Get suggestion statistics."""
         stats = session.query(
@@ -203,7 +411,7 @@ class SuggestionRepo(BaseRepository):
         ).group_by(Suggestion.type, Suggestion.status).all()
         
         return {
-            'total_suggestions': session.query(func.count(Suggestion.id)).scalar(),
+            'total_suggestions': sum(stat.count for stat in stats),
             'by_type_and_status': [
                 {
                     'type': stat.type.value,
@@ -219,6 +427,13 @@ class SuggestionRepo(BaseRepository):
 class WorkflowStateRepo(BaseRepository):
     """Repository operations for workflow states."""
     
+    # Built once; the expanding IN keeps one cached compiled form for any status set
+    _active_workflows_statement = (
+        select(WorkflowState)
+        .where(WorkflowState.status.in_(bindparam("statuses", expanding=True)))
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    
     def __init__(self):
         super().__init__(WorkflowState)
     
@@ -234,19 +449,17 @@ class WorkflowStateRepo(BaseRepository):
             WorkflowState.repository_id == repo_id
         ).order_by(desc(WorkflowState.created_at)).all()
     
-    def get_active_workflows(self, session: Session) -> List[WorkflowState]:
-        """Get currently active workflows."""
-        active_statuses = [
-            WorkflowStatus.INITIALIZED,
-            WorkflowStatus.CLONING_REPO,
-            WorkflowStatus.ANALYZING_CODE,
-            WorkflowStatus.GENERATING_SUGGESTIONS,
-            WorkflowStatus.TESTING_SUGGESTIONS,
-            WorkflowStatus.CREATING_PR
-        ]
-        return session.query(WorkflowState).filter(
-            WorkflowState.status.in_(active_statuses)
-        ).all()
+    def get_active_workflows(self, session: Session) -> Iterator[WorkflowState]:
+        """
+        Stream currently active workflows.
+        
+        Rows are fetched in batches of STREAM_BATCH_SIZE; consume the
+        iterator before the session closes.
+        """
+        return session.scalars(
+            self._active_workflows_statement,
+            {"statuses": ACTIVE_WORKFLOW_STATUSES}
+        )
     
     def get_failed_workflows(self, session: Session) -> List[WorkflowState]:
         """Get failed workflows for analysis."""
@@ -256,15 +469,46 @@ class WorkflowStateRepo(BaseRepository):
     
     def update_status(self, session: Session, workflow_id: str, status: WorkflowStatus, **kwargs) -> Optional[WorkflowState]:
         """Update workflow status."""
-        workflow = self.get_by_workflow_id(session, workflow_id)
-        if workflow:
-            workflow.status = status
-            for key, value in kwargs.items():
-                setattr(workflow, key, value)
-            workflow.updated_at = datetime.utcnow()
-            session.flush()
-            session.refresh(workflow)
-        return workflow
+        kwargs.update(status=status, updated_at=datetime.utcnow())
+        return self._update_returning(session, WorkflowState.workflow_id == workflow_id, kwargs)
+    
+    def record_failures(self, session: Session, failures: List[Tuple[str, str, str]]) -> int:
+        """
+        Mark a batch of workflows failed and record one error per failure.
+        
+        Loads all affected workflows in one query, queues their error rows
+        for a single flush, and sets their status with one UPDATE.
+        
+        Args:
+            session: Database session (committed by the caller)
+            failures: (workflow_id, message, error_type) tuples
+            
+        Returns:
+            Number of workflows found and marked failed
+        """
+        if not failures:
+            return 0
+        
+        workflows = {
+            workflow.workflow_id: workflow
+            for workflow in session.scalars(
+                select(WorkflowState).where(
+                    WorkflowState.workflow_id.in_({failure[0] for failure in failures})
+                )
+            )
+        }
+        for workflow_id, message, error_type in failures:
+            workflow = workflows.get(workflow_id)
+            if workflow:
+                workflow.add_error(message, error_type)
+        
+        if workflows:
+            session.execute(
+                update(WorkflowState)
+                .where(WorkflowState.workflow_id.in_(list(workflows)))
+                .values(status=WorkflowStatus.FAILED, updated_at=datetime.utcnow())
+            )
+        return len(workflows)
     
     def get_workflow_statistics(self, session: Session) -> Dict[str, Any]:
         """Get workflow execution statistics."""
@@ -275,7 +519,7 @@ class WorkflowStateRepo(BaseRepository):
         ).group_by(WorkflowState.status).all()
         
         return {
-            'total_workflows': session.query(func.count(WorkflowState.id)).scalar(),
+            'total_workflows': sum(stat.count for stat in stats),
             'by_status': {stat.status.value: stat.count for stat in stats},
             'avg_execution_times': {
                 stat.status.value: float(stat.avg_execution_time or 0) 
@@ -284,8 +528,126 @@ class WorkflowStateRepo(BaseRepository):
         }
 
 
-# Repository instances
-repository_repo = RepositoryRepo()
-code_analysis_repo = CodeAnalysisRepo()
-suggestion_repo = SuggestionRepo()
-workflow_state_repo = WorkflowStateRepo()
+class WorkflowProgressWriter:
+    """
+    Coalesces workflow progress updates into batched UPDATE statements.
+    
+    Progress ticks are buffered per workflow (the latest tick wins) and
+    written with a single executemany UPDATE once max_batch workflows are
+    pending, a workflow reports 100%, or max_delay seconds have passed since
+    the first buffered tick (a timer flushes even if no further ticks
+    arrive). Updates from a failed write are put back and retried with the
+    next flush. Call flush() when a phase ends to write anything pending.
+    """
+    
+    _update_statement = (
+        update(WorkflowState.__table__)
+        .where(WorkflowState.__table__.c.workflow_id == bindparam("b_workflow_id"))
+        .values(
+            progress_percentage=bindparam("b_progress_percentage"),
+            current_step=bindparam("b_current_step"),
+            current_agent=func.coalesce(
+                bindparam("b_current_agent"), WorkflowState.__table__.c.current_agent
+            ),
+            updated_at=bindparam("b_updated_at")
+        )
+    )
+    
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._first_pending_at = None
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def record(self, workflow_id: str, percentage: float, step: str, agent: str = None) -> None:
+        """Buffer a progress update, flushing if the batch is full or stale."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                self._first_pending_at = now
+            self._pending[workflow_id] = {
+                "b_workflow_id": workflow_id,
+                "b_progress_percentage": min(100.0, max(0.0, percentage)),
+                "b_current_step": step,
+                "b_current_agent": agent,
+                "b_updated_at": datetime.utcnow()
+            }
+            should_flush = (
+                len(self._pending) >= self.max_batch
+                or percentage >= 100.0
+                or now - self._first_pending_at >= self.max_delay
+            )
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_deadline)
+                self._timer.daemon = True
+                self._timer.start()
+        if should_flush:
+            self.flush()
+    
+    def _flush_on_deadline(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            # The batch was put back; the next record() or flush() retries it
+            logger.exception("Failed to write buffered workflow progress")
+    
+    def flush(self, session: Session = None) -> int:
+        """
+        Write all buffered progress updates in one statement.
+        
+        Args:
+            session: Session to execute in; a short-lived one is opened if omitted
+            
+        Returns:
+            Number of workflows updated
+        """
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+            self._first_pending_at = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not batch:
+            return 0
+        
+        try:
+            if session is not None:
+                session.execute(self._update_statement, batch)
+            else:
+                with get_db_session() as own_session:
+                    own_session.execute(self._update_statement, batch)
+        except Exception:
+            self._requeue(batch)
+            raise
+        return len(batch)
+    
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        """Put back updates from a failed write, keeping any newer ticks."""
+        with self._lock:
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            for params in batch:
+                self._pending.setdefault(params["b_workflow_id"], params)
+
+
+# Repository and progress-writer instances, created on first access (PEP 562)
+_REPOSITORY_FACTORIES = {
+    "repository_repo": RepositoryRepo,
+    "code_analysis_repo": CodeAnalysisRepo,
+    "suggestion_repo": SuggestionRepo,
+    "workflow_state_repo": WorkflowStateRepo,
+    "workflow_progress_writer": WorkflowProgressWriter
+}
+
+
+def __getattr__(name: str) -> Any:
+    factory = _REPOSITORY_FACTORIES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache in module globals so later lookups bypass __getattr__
+    return globals().setdefault(name, factory())
@@ -1 +1,13 @@
 # __init__.py for Agentic AI Workflow
+
+from typing import Optional, Dict, Any
+
+
+def merge_context(context: Optional[Dict[str, Any]], **fields) -> Optional[Dict[str, Any]]:
+    """Add the non-None fields to context, creating it only when needed."""
+    for key, value in fields.items():
+        if value is not None:
+            if context is None:
+                context = {}
+            context[key] = value
+    return context
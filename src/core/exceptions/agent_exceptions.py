@@ -6,10 +6,14 @@ Defines custom exceptions for different agent operations and error scenarios.
 
 from typing import Optional, Dict, Any
 
+from src.core.exceptions import merge_context
+
 
 class AgentException(Exception):
     """Base exception for all agent-related errors."""
     
+    __slots__ = ("message", "agent_name", "error_code", "context", "_as_dict")
+    
     def __init__(
         self, 
         message: str, 
@@ -21,37 +25,61 @@ class AgentException(Exception):
         self.agent_name = agent_name
         self.error_code = error_code
         self.context = context or {}
+        self._as_dict = None
         super().__init__(self.message)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert exception to dictionary for logging/serialization."""
-        return {
-            "exception_type": self.__class__.__name__,
-            "message": self.message,
-            "agent_name": self.agent_name,
-            "error_code": self.error_code,
-            "context": self.context
+    def __reduce__(self):
+        # Slot values are not part of __dict__, so hand them to pickle explicitly;
+        # the cached dict is left out and rebuilt on demand
+        state = {
+            name: getattr(self, name)
+            for klass in type(self).__mro__
+            for name in klass.__dict__.get("__slots__", ())
+            if name != "_as_dict" and hasattr(self, name)
         }
+        return self.__class__, self.args, state
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert exception to dictionary for logging/serialization.
+        
+        The dictionary is built on first use and the same object is returned
+        afterwards; treat it as read-only.
+        """
+        if self._as_dict is None:
+            self._as_dict = {
+                "exception_type": self.__class__.__name__,
+                "message": self.message,
+                "agent_name": self.agent_name,
+                "error_code": self.error_code,
+                "context": self.context
+            }
+        return self._as_dict
 
 
 class DeveloperAgentException(AgentException):
     """Exceptions specific to Developer Agent operations."""
-    pass
+    
+    __slots__ = ()
 
 
 class TesterAgentException(AgentException):
     """Exceptions specific to Tester Agent operations."""
-    pass
+    
+    __slots__ = ()
 
 
 class ResearcherAgentException(AgentException):
     """Exceptions specific to Researcher Agent operations."""
-    pass
+    
+    __slots__ = ()
 
 
 class CodeAnalysisException(DeveloperAgentException):
     """Exception raised during code analysis operations."""
     
+    __slots__ = ("file_path", "analysis_type")
+    
     def __init__(
         self, 
         message: str, 
@@ -61,11 +89,11 @@ class CodeAnalysisException(DeveloperAgentException):
     ):
         self.file_path = file_path
         self.analysis_type = analysis_type
-        context = kwargs.get('context', {})
-        context.update({
-            "file_path": file_path,
-            "analysis_type": analysis_type
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            file_path=file_path,
+            analysis_type=analysis_type
+        )
         super().__init__(
             message, 
             agent_name="developer_agent",
@@ -77,6 +105,8 @@ class CodeAnalysisException(DeveloperAgentException):
 class SuggestionGenerationException(DeveloperAgentException):
     """Exception raised during suggestion generation."""
     
+    __slots__ = ("suggestion_type", "file_path")
+    
     def __init__(
         self, 
         message: str, 
@@ -86,11 +116,11 @@ class SuggestionGenerationException(DeveloperAgentException):
     ):
         self.suggestion_type = suggestion_type
         self.file_path = file_path
-        context = kwargs.get('context', {})
-        context.update({
-            "suggestion_type": suggestion_type,
-            "file_path": file_path
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            suggestion_type=suggestion_type,
+            file_path=file_path
+        )
         super().__init__(
             message,
             agent_name="developer_agent",
@@ -102,6 +132,8 @@ class SuggestionGenerationException(DeveloperAgentException):
 class ContextWindowException(AgentException):
     """Exception raised when context window limits are exceeded."""
     
+    __slots__ = ("current_size", "max_size")
+    
     def __init__(
         self, 
         message: str, 
@@ -111,11 +143,11 @@ class ContextWindowException(AgentException):
     ):
         self.current_size = current_size
         self.max_size = max_size
-        context = kwargs.get('context', {})
-        context.update({
-            "current_size": current_size,
-            "max_size": max_size
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            current_size=current_size,
+            max_size=max_size
+        )
         super().__init__(
             message,
             error_code="CONTEXT_WINDOW_EXCEEDED",
@@ -126,6 +158,8 @@ class ContextWindowException(AgentException):
 class AgentCommunicationException(AgentException):
     """Exception raised during agent-to-agent communication."""
     
+    __slots__ = ("from_agent", "to_agent", "communication_type")
+    
     def __init__(
         self, 
         message: str, 
@@ -137,12 +171,12 @@ class AgentCommunicationException(AgentException):
         self.from_agent = from_agent
         self.to_agent = to_agent
         self.communication_type = communication_type
-        context = kwargs.get('context', {})
-        context.update({
-            "from_agent": from_agent,
-            "to_agent": to_agent,
-            "communication_type": communication_type
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            from_agent=from_agent,
+            to_agent=to_agent,
+            communication_type=communication_type
+        )
         super().__init__(
             message,
             error_code="AGENT_COMMUNICATION_ERROR",
@@ -153,6 +187,8 @@ class AgentCommunicationException(AgentException):
 class AgentTimeoutException(AgentException):
     """Exception raised when agent operations timeout."""
     
+    __slots__ = ("timeout_seconds", "operation")
+    
     def __init__(
         self, 
         message: str, 
@@ -162,11 +198,11 @@ class AgentTimeoutException(AgentException):
     ):
         self.timeout_seconds = timeout_seconds
         self.operation = operation
-        context = kwargs.get('context', {})
-        context.update({
-            "timeout_seconds": timeout_seconds,
-            "operation": operation
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            timeout_seconds=timeout_seconds,
+            operation=operation
+        )
         super().__init__(
             message,
             error_code="AGENT_TIMEOUT",
@@ -177,6 +213,8 @@ class AgentTimeoutException(AgentException):
 class AgentConfigurationException(AgentException):
     """Exception raised due to agent configuration issues."""
     
+    __slots__ = ("config_key", "config_value")
+    
     def __init__(
         self, 
         message: str, 
@@ -186,11 +224,11 @@ class AgentConfigurationException(AgentException):
     ):
         self.config_key = config_key
         self.config_value = config_value
-        context = kwargs.get('context', {})
-        context.update({
-            "config_key": config_key,
-            "config_value": str(config_value) if config_value is not None else None
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            config_key=config_key,
+            config_value=str(config_value) if config_value is not None else None
+        )
         super().__init__(
             message,
             error_code="AGENT_CONFIGURATION_ERROR",
@@ -201,6 +239,8 @@ class AgentConfigurationException(AgentException):
 class AgentResourceException(AgentException):
     """Exception raised due to resource constraints."""
     
+    __slots__ = ("resource_type", "current_usage", "limit")
+    
     def __init__(
         self, 
         message: str, 
@@ -212,12 +252,12 @@ class AgentResourceException(AgentException):
         self.resource_type = resource_type
         self.current_usage = current_usage
         self.limit = limit
-        context = kwargs.get('context', {})
-        context.update({
-            "resource_type": resource_type,
-            "current_usage": current_usage,
-            "limit": limit
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            resource_type=resource_type,
+            current_usage=current_usage,
+            limit=limit
+        )
         super().__init__(
             message,
             error_code="AGENT_RESOURCE_ERROR",
@@ -228,6 +268,8 @@ class AgentResourceException(AgentException):
 class SuggestionEvaluationException(TesterAgentException):
     """Exception raised during suggestion evaluation by Tester Agent."""
     
+    __slots__ = ("suggestion_id", "evaluation_type")
+    
     def __init__(
         self, 
         message: str, 
@@ -237,11 +279,11 @@ class SuggestionEvaluationException(TesterAgentException):
     ):
         self.suggestion_id = suggestion_id
         self.evaluation_type = evaluation_type
-        context = kwargs.get('context', {})
-        context.update({
-            "suggestion_id": suggestion_id,
-            "evaluation_type": evaluation_type
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            suggestion_id=suggestion_id,
+            evaluation_type=evaluation_type
+        )
         super().__init__(
             message,
             agent_name="tester_agent",
@@ -253,6 +295,8 @@ class SuggestionEvaluationException(TesterAgentException):
 class FeedbackGenerationException(TesterAgentException):
     """Exception raised during feedback generation."""
     
+    __slots__ = ("feedback_type", "target_suggestion")
+    
     def __init__(
         self, 
         message: str, 
@@ -262,11 +306,11 @@ class FeedbackGenerationException(TesterAgentException):
     ):
         self.feedback_type = feedback_type
         self.target_suggestion = target_suggestion
-        context = kwargs.get('context', {})
-        context.update({
-            "feedback_type": feedback_type,
-            "target_suggestion": target_suggestion
-        })
+        context = merge_context(
+            kwargs.get('context'),
+            feedback_type=feedback_type,
+            target_suggestion=target_suggestion
+        )
         super().__init__(
             message,
             agent_name="tester_agent",
@@ -275,6 +319,23 @@ class FeedbackGenerationException(TesterAgentException):
         )
 
 
+# Exception type name -> class, used by create_agent_exception
+_EXCEPTION_MAP = {
+    "code_analysis": CodeAnalysisException,
+    "suggestion_generation": SuggestionGenerationException,
+    "context_window": ContextWindowException,
+    "agent_communication": AgentCommunicationException,
+    "agent_timeout": AgentTimeoutException,
+    "agent_configuration": AgentConfigurationException,
+    "agent_resource": AgentResourceException,
+    "suggestion_evaluation": SuggestionEvaluationException,
+    "feedback_generation": FeedbackGenerationException,
+    "developer_agent": DeveloperAgentException,
+    "tester_agent": TesterAgentException,
+    "researcher_agent": ResearcherAgentException
+}
+
+
 def handle_agent_exception(
     exception: AgentException, 
     logger = None,
@@ -325,20 +386,5 @@ def create_agent_exception(
     Returns:
         Appropriate AgentException subclass instance
     """
-    exception_map = {
-        "code_analysis": CodeAnalysisException,
-        "suggestion_generation": SuggestionGenerationException,
-        "context_window": ContextWindowException,
-        "agent_communication": AgentCommunicationException,
-        "agent_timeout": AgentTimeoutException,
-        "agent_configuration": AgentConfigurationException,
-        "agent_resource": AgentResourceException,
-        "suggestion_evaluation": SuggestionEvaluationException,
-        "feedback_generation": FeedbackGenerationException,
-        "developer_agent": DeveloperAgentException,
-        "tester_agent": TesterAgentException,
-        "researcher_agent": ResearcherAgentException
-    }
-    
-    exception_class = exception_map.get(exception_type, AgentException)
+    exception_class = _EXCEPTION_MAP.get(exception_type, AgentException)
     return exception_class(message, **kwargs)
\ No newline at end of file
@@ -3,42 +3,190 @@
 Workflow-specific exceptions for state management and orchestration errors.
 """
 
-from typing import Optional, Dict, Any, List
+import atexit
+import collections
+import logging
+import queue
+import threading
+import time
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.logging_config import get_logger
+from src.core.exceptions import merge_context
+
+# Module logger for the failure sink itself; handled exceptions are
+# logged to the logger passed to handle_workflow_exception
+_logger = get_logger(__name__)
+
+# Shared read-only stand-in for exceptions raised without any context
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
+
+# Longest list (e.g. validation_errors, failed_agents) logged in full
+_MAX_LOGGED_LIST_ITEMS = 20
+
+# Released WorkflowRecoveryException instances kept for reuse
+_RECOVERY_POOL_SIZE = 64
+
+# config.database.get_db_session, resolved once on first use: importing
+# config.database loads settings and builds the engine, which must not
+# happen just because this module was imported (None if unavailable)
+_get_db_session = None
+_db_session_resolved = False
+
+
+class WorkflowErrorCode(IntEnum):
+    """Error codes of the workflow exceptions, serialized as integers."""
+    
+    WORKFLOW_STATE_TRANSITION_ERROR = 1
+    WORKFLOW_INITIALIZATION_ERROR = 2
+    WORKFLOW_ORCHESTRATION_ERROR = 3
+    WORKFLOW_TIMEOUT = 4
+    WORKFLOW_CONFIGURATION_ERROR = 5
+    WORKFLOW_DEPENDENCY_ERROR = 6
+    WORKFLOW_DATA_ERROR = 7
+    WORKFLOW_RECOVERY_ERROR = 8
+
+
+def error_code_name(error_code) -> Optional[str]:
+    """Readable name of an error code (plain string codes are returned as-is)."""
+    if isinstance(error_code, WorkflowErrorCode):
+        return error_code.name
+    return error_code
 
 
 class WorkflowException(Exception):
     """Base exception for workflow-related errors."""
     
+    __slots__ = ("message", "workflow_id", "current_state", "error_code", "_context", "_context_built")
+    
+    # Attributes reported by to_dict, and per-class attributes folded into context
+    _DICT_FIELDS = ("message", "workflow_id", "current_state", "error_code")
+    _CONTEXT_FIELDS = ()
+    
+    # exception_type reported by to_dict, set per subclass in __init_subclass__
+    _TYPE_NAME = "WorkflowException"
+    
+    # Stable key for structured log sinks, attached as log_template_id
+    _LOG_TEMPLATE_ID = "WORKFLOW_EXCEPTION"
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._TYPE_NAME = cls.__name__
+    
     def __init__(
         self, 
         message: str,
         workflow_id: str = None,
         current_state: str = None,
-        error_code: str = None,
+        error_code: WorkflowErrorCode = None,
         context: Dict[str, Any] = None
     ):
         self.message = message
         self.workflow_id = workflow_id
         self.current_state = current_state
         self.error_code = error_code
-        self.context = context or {}
+        self._context = context or None
+        self._context_built = False
         super().__init__(self.message)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert exception to dictionary for logging/serialization."""
-        return {
-            "exception_type": self.__class__.__name__,
-            "message": self.message,
-            "workflow_id": self.workflow_id,
-            "current_state": self.current_state,
-            "error_code": self.error_code,
-            "context": self.context
+    def __reduce__(self):
+        # Slot values are not part of __dict__, so hand them to pickle explicitly
+        state = {
+            name: getattr(self, name)
+            for klass in type(self).__mro__
+            for name in klass.__dict__.get("__slots__", ())
+            if hasattr(self, name)
         }
+        return self.__class__, self.args, state
+    
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """
+        Exception context, including the non-None _CONTEXT_FIELDS values.
+        
+        Built on first access, so exceptions that are raised and caught
+        without being inspected never allocate it; a shared empty mapping
+        is returned when there is nothing to record.
+        """
+        if not self._context_built:
+            self._context = merge_context(
+                self._context,
+                **{name: getattr(self, name) for name in self._CONTEXT_FIELDS}
+            )
+            self._context_built = True
+        return self._context if self._context is not None else _EMPTY_MAP
+    
+    @context.setter
+    def context(self, value: Optional[Dict[str, Any]]) -> None:
+        self._context = value or None
+        self._context_built = True
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert exception to dictionary for logging/serialization.
+        
+        error_code is emitted as its integer value, with the readable name
+        alongside in error_code_name.
+        """
+        payload = {"exception_type": self._TYPE_NAME}
+        for name in self._DICT_FIELDS:
+            payload[name] = getattr(self, name)
+        error_code = self.error_code
+        if isinstance(error_code, WorkflowErrorCode):
+            payload["error_code"] = int(error_code)
+        payload["error_code_name"] = error_code_name(error_code)
+        context = self.context
+        payload["context"] = context if context is not _EMPTY_MAP else {}
+        return payload
+
+
+class _FieldWorkflowException(WorkflowException):
+    """
+    Shared constructor for workflow exceptions described by class attributes.
+    
+    Subclasses list their fields in _CONTEXT_FIELDS and set _ERROR_CODE;
+    fields are accepted positionally after the message or by keyword, and
+    those in _LIST_FIELDS default to an empty list. A workflow_id and
+    context keyword are passed on to WorkflowException.
+    """
+    
+    __slots__ = ()
+    
+    _ERROR_CODE: Optional[WorkflowErrorCode] = None
+    _LIST_FIELDS = ()
+    _CURRENT_STATE: Optional[str] = None
+    
+    def __init__(self, message: str, *values: Any, **kwargs):
+        fields = self._CONTEXT_FIELDS
+        if len(values) > len(fields):
+            raise TypeError(
+                f"{self._TYPE_NAME}() takes at most {len(fields)} field arguments "
+                f"({len(values)} given)"
+            )
+        for index, name in enumerate(fields):
+            value = values[index] if index < len(values) else kwargs.get(name)
+            if value is None and name in self._LIST_FIELDS:
+                value = []
+            setattr(self, name, value)
+        super().__init__(
+            message,
+            workflow_id=kwargs.get('workflow_id'),
+            current_state=self._CURRENT_STATE,
+            error_code=self._ERROR_CODE,
+            context=kwargs.get('context')
+        )
 
 
 class WorkflowStateException(WorkflowException):
     """Exception raised during workflow state transitions."""
     
+    __slots__ = ("from_state", "to_state")
+    _CONTEXT_FIELDS = ("from_state", "to_state")
+    
     def __init__(
         self, 
         message: str,
@@ -49,243 +197,324 @@ class WorkflowStateException(WorkflowException):
     ):
         self.from_state = from_state
         self.to_state = to_state
-        context = kwargs.get('context', {})
-        context.update({
-            "from_state": from_state,
-            "to_state": to_state
-        })
         super().__init__(
             message,
             workflow_id=workflow_id,
             current_state=from_state,
-            error_code="WORKFLOW_STATE_TRANSITION_ERROR",
-            context=context
+            error_code=WorkflowErrorCode.WORKFLOW_STATE_TRANSITION_ERROR,
+            context=kwargs.get('context')
         )
 
 
-class WorkflowInitializationException(WorkflowException):
+class WorkflowInitializationException(_FieldWorkflowException):
     """Exception raised during workflow initialization."""
     
-    def __init__(
-        self, 
-        message: str,
-        repository_url: str = None,
-        initialization_step: str = None,
-        **kwargs
-    ):
-        self.repository_url = repository_url
-        self.initialization_step = initialization_step
-        context = kwargs.get('context', {})
-        context.update({
-            "repository_url": repository_url,
-            "initialization_step": initialization_step
-        })
-        super().__init__(
-            message,
-            current_state="initialization",
-            error_code="WORKFLOW_INITIALIZATION_ERROR",
-            context=context
-        )
+    __slots__ = ("repository_url", "initialization_step")
+    _CONTEXT_FIELDS = ("repository_url", "initialization_step")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_INITIALIZATION_ERROR
+    _CURRENT_STATE = "initialization"
 
 
-class WorkflowOrchestrationException(WorkflowException):
+class WorkflowOrchestrationException(_FieldWorkflowException):
     """Exception raised during workflow orchestration."""
     
-    def __init__(
-        self, 
-        message: str,
-        orchestration_phase: str = None,
-        failed_agents: List[str] = None,
-        **kwargs
-    ):
-        self.orchestration_phase = orchestration_phase
-        self.failed_agents = failed_agents or []
-        context = kwargs.get('context', {})
-        context.update({
-            "orchestration_phase": orchestration_phase,
-            "failed_agents": self.failed_agents
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_ORCHESTRATION_ERROR",
-            context=context
-        )
+    __slots__ = ("orchestration_phase", "failed_agents")
+    _CONTEXT_FIELDS = ("orchestration_phase", "failed_agents")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_ORCHESTRATION_ERROR
+    _LIST_FIELDS = ("failed_agents",)
 
 
-class WorkflowTimeoutException(WorkflowException):
+class WorkflowTimeoutException(_FieldWorkflowException):
     """Exception raised when workflow execution times out."""
     
-    def __init__(
-        self, 
-        message: str,
-        timeout_seconds: int = None,
-        elapsed_seconds: float = None,
-        **kwargs
-    ):
-        self.timeout_seconds = timeout_seconds
-        self.elapsed_seconds = elapsed_seconds
-        context = kwargs.get('context', {})
-        context.update({
-            "timeout_seconds": timeout_seconds,
-            "elapsed_seconds": elapsed_seconds
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_TIMEOUT",
-            context=context
-        )
+    __slots__ = ("timeout_seconds", "elapsed_seconds")
+    _CONTEXT_FIELDS = ("timeout_seconds", "elapsed_seconds")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_TIMEOUT
 
 
-class WorkflowConfigurationException(WorkflowException):
+class WorkflowConfigurationException(_FieldWorkflowException):
     """Exception raised due to workflow configuration issues."""
     
-    def __init__(
-        self, 
-        message: str,
-        config_section: str = None,
-        missing_config: List[str] = None,
-        **kwargs
-    ):
-        self.config_section = config_section
-        self.missing_config = missing_config or []
-        context = kwargs.get('context', {})
-        context.update({
-            "config_section": config_section,
-            "missing_config": self.missing_config
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_CONFIGURATION_ERROR",
-            context=context
-        )
+    __slots__ = ("config_section", "missing_config")
+    _CONTEXT_FIELDS = ("config_section", "missing_config")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_CONFIGURATION_ERROR
+    _LIST_FIELDS = ("missing_config",)
 
 
-class WorkflowDependencyException(WorkflowException):
+class WorkflowDependencyException(_FieldWorkflowException):
     """Exception raised when workflow dependencies are not met."""
     
-    def __init__(
-        self, 
-        message: str,
-        missing_dependencies: List[str] = None,
-        dependency_type: str = None,
-        **kwargs
-    ):
-        self.missing_dependencies = missing_dependencies or []
-        self.dependency_type = dependency_type
-        context = kwargs.get('context', {})
-        context.update({
-            "missing_dependencies": self.missing_dependencies,
-            "dependency_type": dependency_type
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_DEPENDENCY_ERROR",
-            context=context
-        )
+    __slots__ = ("missing_dependencies", "dependency_type")
+    _CONTEXT_FIELDS = ("missing_dependencies", "dependency_type")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_DEPENDENCY_ERROR
+    _LIST_FIELDS = ("missing_dependencies",)
 
 
-class WorkflowDataException(WorkflowException):
+class WorkflowDataException(_FieldWorkflowException):
     """Exception raised due to workflow data issues."""
     
-    def __init__(
-        self, 
-        message: str,
-        data_type: str = None,
-        validation_errors: List[str] = None,
-        **kwargs
-    ):
-        self.data_type = data_type
-        self.validation_errors = validation_errors or []
-        context = kwargs.get('context', {})
-        context.update({
-            "data_type": data_type,
-            "validation_errors": self.validation_errors
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_DATA_ERROR",
-            context=context
-        )
+    __slots__ = ("data_type", "validation_errors")
+    _CONTEXT_FIELDS = ("data_type", "validation_errors")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_DATA_ERROR
+    _LIST_FIELDS = ("validation_errors",)
 
 
-class WorkflowRecoveryException(WorkflowException):
+class WorkflowRecoveryException(_FieldWorkflowException):
     """Exception raised during workflow recovery attempts."""
     
-    def __init__(
-        self, 
-        message: str,
-        recovery_attempt: int = None,
-        max_attempts: int = None,
-        **kwargs
-    ):
-        self.recovery_attempt = recovery_attempt
-        self.max_attempts = max_attempts
-        context = kwargs.get('context', {})
-        context.update({
-            "recovery_attempt": recovery_attempt,
-            "max_attempts": max_attempts
-        })
-        super().__init__(
-            message,
-            error_code="WORKFLOW_RECOVERY_ERROR",
-            context=context
-        )
+    __slots__ = ("recovery_attempt", "max_attempts")
+    _CONTEXT_FIELDS = ("recovery_attempt", "max_attempts")
+    _ERROR_CODE = WorkflowErrorCode.WORKFLOW_RECOVERY_ERROR
+
+
+# Exception type name -> class, used by create_workflow_exception (read-only)
+_EXCEPTION_MAP: Mapping[str, type] = MappingProxyType({
+    "state_transition": WorkflowStateException,
+    "initialization": WorkflowInitializationException,
+    "orchestration": WorkflowOrchestrationException,
+    "timeout": WorkflowTimeoutException,
+    "configuration": WorkflowConfigurationException,
+    "dependency": WorkflowDependencyException,
+    "data": WorkflowDataException,
+    "recovery": WorkflowRecoveryException
+})
+
+
+_RECOVERY_POOL: "collections.deque[WorkflowRecoveryException]" = collections.deque(
+    maxlen=_RECOVERY_POOL_SIZE
+)
+
+
+def acquire_recovery_exception(message: str, **kwargs) -> WorkflowRecoveryException:
+    """
+    Get a WorkflowRecoveryException, reusing a released instance if any.
+    
+    Meant for retry loops that raise and catch the exception locally on
+    every attempt. Pair each call with release() in a finally block, and
+    never release an exception that is re-raised to other code or passed
+    to handle_workflow_exception(..., background=True) (the failure sink
+    reads it later):
+    
+        exc = acquire_recovery_exception("retry failed", recovery_attempt=n)
+        try:
+            ...
+        finally:
+            release(exc)
+    """
+    try:
+        exception = _RECOVERY_POOL.pop()
+    except IndexError:
+        return WorkflowRecoveryException(message, **kwargs)
+    
+    # Re-run __init__ in place so every field (and args) is reset
+    exception.__init__(message, **kwargs)
+    return exception
+
+
+def release(exception: WorkflowException) -> None:
+    """Return an exception from acquire_recovery_exception to the pool."""
+    if type(exception) is not WorkflowRecoveryException:
+        return
+    
+    # Drop frame and chained exception references so they can be collected
+    exception.__traceback__ = None
+    exception.__context__ = None
+    exception.__cause__ = None
+    _RECOVERY_POOL.append(exception)
+
+
+def _resolve_db_session():
+    """Return config.database.get_db_session, or None if it cannot be imported."""
+    global _get_db_session, _db_session_resolved
+    if not _db_session_resolved:
+        try:
+            from config.database import get_db_session
+        except ImportError:
+            get_db_session = None
+        _get_db_session = get_db_session
+        _db_session_resolved = True
+    return _get_db_session
+
+
+def _compact_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Shorten oversized list values in context before it is logged."""
+    oversized = [
+        key for key, value in context.items()
+        if isinstance(value, list) and len(value) > _MAX_LOGGED_LIST_ITEMS
+    ]
+    if not oversized:
+        return context
+    
+    compacted = dict(context)
+    for key in oversized:
+        value = context[key]
+        compacted[key] = value[:_MAX_LOGGED_LIST_ITEMS] + [
+            f"... {len(value) - _MAX_LOGGED_LIST_ITEMS} more"
+        ]
+    return compacted
+
+
+def _record_handled_exceptions(batch: List[tuple]) -> None:
+    """
+    Log each (logger, workflow_state_repo, exception) entry and record the
+    workflow failures of the whole batch in one session and commit.
+    """
+    failures_by_repo = {}
+    loggers = set()
+    for logger, workflow_state_repo, exception in batch:
+        # The serialized dict doubles as the log record's extra fields;
+        # "message" is reserved on LogRecord, so it goes in the format args
+        error_details = exception.to_dict()
+        message = error_details.pop("message")
+        if logger:
+            error_details["context"] = _compact_context(error_details["context"])
+            error_details["log_template_id"] = exception._LOG_TEMPLATE_ID
+            logger.error("Workflow Exception: %s", message, extra=error_details)
+            loggers.add(logger)
+        if workflow_state_repo and error_details["workflow_id"]:
+            failures_by_repo.setdefault(workflow_state_repo, []).append((
+                error_details["workflow_id"],
+                message,
+                error_details["error_code_name"] or "workflow_error"
+            ))
+    
+    # Update workflow state for every repository provided, in one transaction
+    if failures_by_repo:
+        try:
+            get_db_session = _resolve_db_session()
+            if get_db_session is not None:
+                with get_db_session() as session:
+                    for workflow_state_repo, failures in failures_by_repo.items():
+                        workflow_state_repo.record_failures(session, failures)
+        except SQLAlchemyError as e:
+            for logger in loggers:
+                logger.error("Failed to update workflow state: %s", e)
+
+
+class WorkflowFailureSink:
+    """
+    Background worker that logs handled workflow exceptions in batches.
+    
+    Used by handle_workflow_exception(..., background=True), which then only
+    enqueues the exception itself; a daemon thread (started on first use)
+    drains up to max_batch entries, or whatever arrived within
+    flush_interval seconds of the first, and hands them to
+    _record_handled_exceptions. Call flush() to wait until everything
+    queued so far has been processed; it also runs at interpreter exit.
+    """
+    
+    def __init__(self, max_batch: int = 100, flush_interval: float = 0.1):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, logger, workflow_state_repo, exception: WorkflowException) -> None:
+        """Queue one handled exception for logging and state recording."""
+        if self._thread is None:
+            self._start()
+        self._queue.put((logger, workflow_state_repo, exception))
+    
+    def flush(self) -> None:
+        """Block until every queued entry has been processed."""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run, name="workflow-failure-sink", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+                atexit.register(self.flush)
+    
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                _record_handled_exceptions(batch)
+            except Exception:
+                # Keep the worker alive so later submissions and flush() still work
+                _logger.exception("Failed to process workflow failure batch")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+workflow_failure_sink = WorkflowFailureSink()
 
 
 def handle_workflow_exception(
     exception: WorkflowException,
     logger = None,
     workflow_state_repo = None,
-    reraise: bool = True
+    reraise: bool = True,
+    session = None,
+    background: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
     Handle workflow exceptions with standardized logging and state updates.
     
+    By default the exception is logged and the workflow marked failed
+    before this returns. With background=True both happen later on
+    workflow_failure_sink, batched with other failures; call
+    workflow_failure_sink.flush() when they must be complete before
+    continuing. If a session is given, the workflow state update is
+    instead applied to it right away and left for the caller to commit,
+    so a batch of failures can share one transaction.
+    
     Args:
         exception: The workflow exception to handle
         logger: Logger instance for error logging
         workflow_state_repo: Repository for updating workflow state
         reraise: Whether to reraise the exception after handling
+        session: Open database session for the workflow state update
+            (not committed here)
+        background: Log and record on the background failure sink
         
     Returns:
         Exception details as dictionary, if not reraised
     """
-    error_details = exception.to_dict()
-    
-    if logger:
-        logger.error(
-            f"Workflow Exception: {exception.message}",
-            extra={
-                "workflow_id": exception.workflow_id,
-                "current_state": exception.current_state,
-                "error_code": exception.error_code,
-                "context": exception.context
-            }
-        )
+    if session is not None and workflow_state_repo and exception.workflow_id:
+        workflow_state_repo.record_failures(session, [(
+            exception.workflow_id,
+            exception.message,
+            error_code_name(exception.error_code) or "workflow_error"
+        )])
+        workflow_state_repo = None
     
-    # Update workflow state if repository provided
-    if workflow_state_repo and exception.workflow_id:
-        try:
-            from config.database import get_db_session
-            with get_db_session() as session:
-                workflow = workflow_state_repo.get_by_workflow_id(session, exception.workflow_id)
-                if workflow:
-                    workflow.add_error(exception.message, exception.error_code or "workflow_error")
-                    workflow.status = "failed"
-                    session.commit()
-        except Exception as e:
-            if logger:
-                logger.error(f"Failed to update workflow state: {e}")
+    # Skip serializing and building log fields for a logger that drops errors
+    if logger is not None and not logger.isEnabledFor(logging.ERROR):
+        logger = None
+    
+    if logger or (workflow_state_repo and exception.workflow_id):
+        if background:
+            workflow_failure_sink.submit(logger, workflow_state_repo, exception)
+        else:
+            _record_handled_exceptions([(logger, workflow_state_repo, exception)])
     
     if reraise:
         raise exception
     
-    return error_details
+    return exception.to_dict()
 
 
 def create_workflow_exception(
     exception_type: str,
     message: str,
+    pooled: bool = False,
     **kwargs
 ) -> WorkflowException:
     """
@@ -294,21 +523,15 @@ def create_workflow_exception(
     Args:
         exception_type: Type of exception to create
         message: Error message
+        pooled: Take "recovery" exceptions from the reuse pool; the caller
+            must hand them back with release() (see acquire_recovery_exception)
         **kwargs: Additional context and parameters
         
     Returns:
         Appropriate WorkflowException subclass instance
     """
-    exception_map = {
-        "state_transition": WorkflowStateException,
-        "initialization": WorkflowInitializationException,
-        "orchestration": WorkflowOrchestrationException,
-        "timeout": WorkflowTimeoutException,
-        "configuration": WorkflowConfigurationException,
-        "dependency": WorkflowDependencyException,
-        "data": WorkflowDataException,
-        "recovery": WorkflowRecoveryException
-    }
-    
-    exception_class = exception_map.get(exception_type, WorkflowException)
+    if pooled and exception_type == "recovery":
+        return acquire_recovery_exception(message, **kwargs)
+    
+    exception_class = _EXCEPTION_MAP.get(exception_type, WorkflowException)
     return exception_class(message, **kwargs)
\ No newline at end of file
@@ -6,45 +6,68 @@ Tests models, connections, repositories, and migrations.
 """
 
 import pytest
+import threading
 import tempfile
 import os
 from datetime import datetime
 from pathlib import Path
 from sqlalchemy import text
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from src.core.database.models import (
     Base, Repository, CodeAnalysis, Suggestion, WorkflowState,
     AnalysisStatus, SuggestionStatus, SuggestionType, WorkflowStatus
 )
 from src.core.database.repositories import (
-    repository_repo, code_analysis_repo, suggestion_repo, workflow_state_repo
+    repository_repo, code_analysis_repo, suggestion_repo, workflow_state_repo,
+    WorkflowProgressWriter
 )
 from src.core.database.connection import DatabaseConnection, TransactionManager
+from config.database import configure_sqlite_engine
 
 
-@pytest.fixture
-def temp_db(tmp_path):
-    """Create a temporary database for testing."""
-    db_file = tmp_path / "test.db"
-    db_url = f"sqlite:///{db_file}"
-    engine = create_engine(db_url)
+@pytest.fixture(scope="module")
+def temp_db():
+    """
+    Create an in-memory database, with its schema, shared by this module.
+    
+    A private :memory: database belongs to the process that opened it, so
+    each pytest-xdist worker (pytest -n auto) gets its own.
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    # Same connection setup as the application engine (pragmas, explicit BEGIN)
+    configure_sqlite_engine(engine)
     Base.metadata.create_all(bind=engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     yield SessionLocal, engine
     engine.dispose()
-    
 
 
 @pytest.fixture
 def db_session(temp_db):
-    """Create a database session for testing."""
+    """
+    Create a database session for testing.
+    
+    The session runs inside an outer transaction that is rolled back after
+    the test; its commits only release SAVEPOINTs, so every test starts
+    from an empty database.
+    """
     SessionLocal, engine = temp_db
-    session = SessionLocal()
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     yield session
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
 class TestDatabaseModels:
@@ -97,7 +120,14 @@ class TestDatabaseModels:
         
         assert analysis.id is not None
         assert analysis.repository_id == repo.id
-        assert analysis.status == AnalysisStatus.PENDING
+        assert analysis.status is AnalysisStatus.PENDING
+        
+        # Rows written by the earlier Enum column type hold member names
+        db_session.execute(
+            text("UPDATE code_analyses SET status = 'COMPLETED' WHERE id = :id"), {"id": analysis.id}
+        )
+        db_session.expire(analysis)
+        assert analysis.status is AnalysisStatus.COMPLETED
         assert analysis.repository == repo
     
     def test_suggestion_model_creation(self, db_session):
@@ -131,7 +161,7 @@ class TestDatabaseModels:
         db_session.commit()
         
         assert suggestion.id is not None
-        assert suggestion.status == SuggestionStatus.GENERATED
+        assert suggestion.status is SuggestionStatus.GENERATED
         assert suggestion.analysis == analysis
     
     def test_workflow_state_model_creation(self, db_session):
@@ -163,14 +193,18 @@ class TestDatabaseModels:
         
         # Test completion
         workflow.mark_completed(success=True)
-        assert workflow.status == WorkflowStatus.COMPLETED
+        assert workflow.status is WorkflowStatus.COMPLETED
         assert workflow.progress_percentage == 100.0
         assert workflow.end_time is not None
         
         # Test error addition
         workflow.add_error("Test error", "test_error")
-        assert len(workflow.error_log) == 1
-        assert workflow.error_log[0]["message"] == "Test error"
+        db_session.flush()
+        errors = workflow.errors.all()
+        assert len(errors) == 1
+        assert errors[0].message == "Test error"
+        assert errors[0].type == "test_error"
+        assert errors[0].agent == "developer_agent"
 
 class TestDatabaseRepositories:
     """Test repository pattern implementations."""
@@ -267,17 +301,60 @@ class TestDatabaseRepositories:
         )
         assert found_analysis.id == analysis.id
         
+        # Test projected file listing
+        files = code_analysis_repo.list_files(db_session, repo.id)
+        assert [(f.id, f.file_path, f.status) for f in files] == [
+            (analysis.id, "src/main.py", AnalysisStatus.COMPLETED)
+        ]
+        
         # Test status update
         updated_analysis = code_analysis_repo.update_status(
             db_session, analysis.id, AnalysisStatus.FAILED
         )
-        assert updated_analysis.status == AnalysisStatus.FAILED
+        assert updated_analysis.status is AnalysisStatus.FAILED
         
         # Test summary stats
         stats = code_analysis_repo.get_summary_stats(db_session, repo.id)
         assert stats['total_files'] == 1
         assert AnalysisStatus.FAILED.value in stats['by_status']
     
+    def test_create_many(self, db_session):
+        """Test batched inserts through BaseRepository.create_many."""
+        repo = repository_repo.create(
+            db_session,
+            url="https://github.com/test/repo",
+            name="repo",
+            owner="test"
+        )
+        
+        rows = [
+            {"repository_id": repo.id, "file_path": f"src/module_{i}.py", "status": AnalysisStatus.COMPLETED}
+            for i in range(5)
+        ]
+        ids = code_analysis_repo.create_many(db_session, rows)
+        assert len(ids) == 5
+        
+        analyses = code_analysis_repo.get_by_repository(db_session, repo.id)
+        assert sorted(a.id for a in analyses) == sorted(ids)
+        assert code_analysis_repo.get_by_id(db_session, ids[0]).file_path == "src/module_0.py"
+        
+        assert code_analysis_repo.create_many(db_session, []) == []
+        
+        # Batched repositories get url_hash filled in and are found by URL
+        urls = ["https://github.com/test/batch_a", "https://github.com/test/batch_b"]
+        repo_ids = repository_repo.create_many(db_session, [
+            {"url": url, "name": url.rsplit("/", 1)[1], "owner": "test"} for url in urls
+        ])
+        assert [repository_repo.get_by_url(db_session, url).id for url in urls] == repo_ids
+        
+        # Rows without url_hash (created before migration 005) are still found and backfilled
+        db_session.execute(
+            update(Repository).where(Repository.id == repo_ids[0]).values(url_hash=None)
+        )
+        legacy_repo = repository_repo.get_by_url(db_session, urls[0])
+        assert legacy_repo.id == repo_ids[0]
+        assert legacy_repo.url_hash is not None
+    
     def test_suggestion_repo_operations(self, db_session):
         """Test SuggestionRepo operations."""
         # Setup
@@ -329,14 +406,38 @@ class TestDatabaseRepositories:
         high_conf = suggestion_repo.get_high_confidence(db_session, min_confidence=0.8)
         assert len(high_conf) == 1
         assert high_conf[0].id == suggestion1.id
+        assert suggestion_repo.count_high_confidence(db_session, min_confidence=0.8) == 1
+        
+        # Test count by repository
+        assert suggestion_repo.count_by_repository(db_session, repo.id) == 2
+        
+        # Test projected summaries
+        summaries = suggestion_repo.list_summaries(db_session, repo.id)
+        assert {summary.id for summary in summaries} == {suggestion1.id, suggestion2.id}
+        assert all(summary.status is SuggestionStatus.GENERATED for summary in summaries)
         
         # Test status update
         updated_suggestion = suggestion_repo.update_status(
             db_session, suggestion1.id, SuggestionStatus.APPROVED, "Looks good"
         )
-        assert updated_suggestion.status == SuggestionStatus.APPROVED
+        assert updated_suggestion.status is SuggestionStatus.APPROVED
         assert updated_suggestion.feedback == "Looks good"
         assert updated_suggestion.reviewed_at is not None
+        
+        # Test bulk status update
+        updated = suggestion_repo.update_status_many(
+            db_session, [suggestion1.id, suggestion2.id], SuggestionStatus.REJECTED
+        )
+        assert updated == 2
+        db_session.expire_all()
+        assert suggestion1.status is SuggestionStatus.REJECTED
+        assert suggestion2.status is SuggestionStatus.REJECTED
+        assert suggestion1.feedback == "Looks good"
+        
+        # Test delete
+        assert suggestion_repo.delete(db_session, suggestion2.id) is True
+        assert suggestion_repo.delete(db_session, suggestion2.id) is False
+        assert suggestion_repo.count_by_repository(db_session, repo.id) == 1
 
     def delete(db_session, repo_id):
         repo = db_session.query(Repository).filter(Repository.id == repo_id).first()
@@ -380,7 +481,7 @@ class TestDatabaseRepositories:
         assert len(workflows) == 2
         
         # Test get active workflows
-        active_workflows = workflow_state_repo.get_active_workflows(db_session)
+        active_workflows = list(workflow_state_repo.get_active_workflows(db_session))
         assert len(active_workflows) == 1
         assert active_workflows[0].id == workflow1.id
         
@@ -389,8 +490,110 @@ class TestDatabaseRepositories:
             db_session, "workflow_123", WorkflowStatus.FAILED,
             current_step="error_occurred"
         )
-        assert updated_workflow.status == WorkflowStatus.FAILED
+        assert updated_workflow.status is WorkflowStatus.FAILED
         assert updated_workflow.current_step == "error_occurred"
+    
+    def test_workflow_progress_writer_batches_updates(self, db_session):
+        """Test WorkflowProgressWriter coalesces ticks into one batched write."""
+        repo = repository_repo.create(
+            db_session,
+            url="https://github.com/test/repo",
+            name="repo",
+            owner="test"
+        )
+        workflow_state_repo.create(
+            db_session,
+            repository_id=repo.id,
+            workflow_id="workflow_progress",
+            status=WorkflowStatus.ANALYZING_CODE,
+            current_agent="developer_agent"
+        )
+        db_session.commit()
+        
+        writer = WorkflowProgressWriter(max_batch=100, max_delay=60.0)
+        writer.record("workflow_progress", 10.0, "parsing")
+        writer.record("workflow_progress", -5.0, "analyzing")
+        
+        assert writer.flush(db_session) == 1
+        assert writer.flush(db_session) == 0
+        db_session.commit()
+        db_session.expire_all()
+        
+        workflow = workflow_state_repo.get_by_workflow_id(db_session, "workflow_progress")
+        assert workflow.progress_percentage == 0.0
+        assert workflow.current_step == "analyzing"
+        assert workflow.current_agent == "developer_agent"
+    
+    def test_workflow_progress_writer_requeues_failed_batch(self, db_session):
+        """Test updates from a failed write are kept and written by the next flush."""
+        writer = WorkflowProgressWriter(max_batch=100, max_delay=60.0)
+        writer.record("workflow_progress", 10.0, "parsing")
+        
+        class FailingSession:
+            def execute(self, statement, params):
+                raise OperationalError("UPDATE", params, Exception("database is locked"))
+        
+        with pytest.raises(OperationalError):
+            writer.flush(FailingSession())
+        writer.record("workflow_progress", 20.0, "analyzing")
+        writer.record("workflow_other", 5.0, "cloning")
+        
+        assert writer.flush(db_session) == 2
+    
+    def test_workflow_progress_writer_flushes_on_deadline(self, monkeypatch):
+        """Test buffered ticks are written after max_delay without further records."""
+        flushed = threading.Event()
+        writer = WorkflowProgressWriter(max_batch=100, max_delay=0.01)
+        monkeypatch.setattr(writer, "flush", lambda session=None: flushed.set())
+        
+        writer.record("workflow_progress", 10.0, "parsing")
+        
+        assert flushed.wait(timeout=2)
+    
+    def test_workflow_progress_writer_flushes_on_completion(self, db_session, monkeypatch):
+        """Test a 100% tick is written right away."""
+        writer = WorkflowProgressWriter(max_batch=100, max_delay=60.0)
+        flushes = []
+        monkeypatch.setattr(writer, "flush", lambda session=None: flushes.append(True))
+        
+        writer.record("workflow_progress", 50.0, "analyzing")
+        assert flushes == []
+        writer.record("workflow_progress", 100.0, "done")
+        assert flushes == [True]
+        writer._timer.cancel()
+    
+    def test_workflow_state_repo_record_failures(self, db_session):
+        """Test WorkflowStateRepo.record_failures marks a batch of workflows failed."""
+        repo = repository_repo.create(
+            db_session,
+            url="https://github.com/test/repo",
+            name="repo",
+            owner="test"
+        )
+        for workflow_id in ("workflow_a", "workflow_b"):
+            workflow_state_repo.create(
+                db_session,
+                repository_id=repo.id,
+                workflow_id=workflow_id,
+                status=WorkflowStatus.ANALYZING_CODE
+            )
+        db_session.commit()
+        
+        recorded = workflow_state_repo.record_failures(db_session, [
+            ("workflow_a", "Clone failed", "WORKFLOW_INITIALIZATION_ERROR"),
+            ("workflow_a", "Retry failed", "WORKFLOW_RECOVERY_ERROR"),
+            ("workflow_b", "Timed out", "WORKFLOW_TIMEOUT"),
+            ("workflow_missing", "Ignored", "WORKFLOW_TIMEOUT")
+        ])
+        db_session.commit()
+        
+        assert recorded == 2
+        workflow_a = workflow_state_repo.get_by_workflow_id(db_session, "workflow_a")
+        workflow_b = workflow_state_repo.get_by_workflow_id(db_session, "workflow_b")
+        assert workflow_a.status is WorkflowStatus.FAILED
+        assert workflow_b.status is WorkflowStatus.FAILED
+        assert [error.message for error in workflow_a.errors.order_by("id")] == ["Clone failed", "Retry failed"]
+        assert workflow_b.errors.count() == 1
 
 
 class TestDatabaseConnection:
@@ -452,82 +655,119 @@ class TestDatabaseConnection:
         assert found_repo is None
 
 
+    def test_transaction_manager_nested_rollback(self, db_session):
+        """Test transaction manager uses a savepoint inside an active transaction."""
+        outer_repo = Repository(
+            url="https://github.com/test/outer",
+            name="outer",
+            owner="test"
+        )
+        db_session.add(outer_repo)
+        db_session.flush()
+        
+        try:
+            with TransactionManager(db_session) as session:
+                session.add(Repository(
+                    url="https://github.com/test/inner",
+                    name="inner",
+                    owner="test"
+                ))
+                session.flush()
+                raise ValueError("Test error")
+        except ValueError:
+            pass
+        
+        # Only the savepoint was rolled back
+        assert db_session.query(Repository).filter_by(name="outer").first() is not None
+        assert db_session.query(Repository).filter_by(name="inner").first() is None
+
+
+    def test_transaction_manager_savepoint_after_reads(self, tmp_path):
+        """Test a savepoint opened after only reads is undone by the outer rollback."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'savepoint.db'}")
+        configure_sqlite_engine(engine)
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        try:
+            session.query(Repository).count()
+            with TransactionManager(session) as nested:
+                nested.add(Repository(url="https://github.com/test/inner", name="inner", owner="test"))
+            session.rollback()
+            
+            assert session.query(Repository).filter_by(name="inner").first() is None
+        finally:
+            session.close()
+            engine.dispose()
+
+
 class TestDatabaseIntegration:
     """Integration tests for database functionality."""
     
     def test_complete_workflow_data_flow(self, db_session):
         """Test complete data flow through all models."""
-        # Create repository
-        repo = repository_repo.create(
-            db_session,
-            url="https://github.com/test/repo",
-            name="repo",
-            owner="test",
-            description="Integration test repository"
-        )
-        
-        # Create workflow
-        workflow = workflow_state_repo.create(
-            db_session,
-            repository_id=repo.id,
-            workflow_id="integration_test_workflow",
-            status=WorkflowStatus.ANALYZING_CODE
-        )
-        
-        # Create analyses
-        analysis1 = code_analysis_repo.create(
-            db_session,
-            repository_id=repo.id,
-            file_path="src/main.py",
-            language="Python",
-            status=AnalysisStatus.COMPLETED,
-            complexity_score=5.2,
-            quality_score=7.8
-        )
-        
-        analysis2 = code_analysis_repo.create(
-            db_session,
-            repository_id=repo.id,
-            file_path="src/utils.py",
-            language="Python",
-            status=AnalysisStatus.COMPLETED,
-            complexity_score=3.1,
-            quality_score=8.9
-        )
-        
-        # Create suggestions
-        suggestion1 = suggestion_repo.create(
-            db_session,
-            analysis_id=analysis1.id,
-            type=SuggestionType.BUG_FIX,
-            title="Fix null pointer",
-            description="Add null check",
-            confidence_score=0.95
-        )
+        # Insert fixture rows with Core INSERT ... RETURNING, without ORM objects
+        repo_url = "https://github.com/test/repo"
+        [repo_id] = repository_repo.create_many(db_session, [{
+            "url": repo_url,
+            "name": "repo",
+            "owner": "test",
+            "description": "Integration test repository"
+        }])
+        workflow_state_repo.create_many(db_session, [{
+            "repository_id": repo_id,
+            "workflow_id": "integration_test_workflow",
+            "status": WorkflowStatus.ANALYZING_CODE
+        }], return_ids=False)
+        analysis1_id, analysis2_id = code_analysis_repo.create_many(db_session, [
+            {
+                "repository_id": repo_id,
+                "file_path": "src/main.py",
+                "language": "Python",
+                "status": AnalysisStatus.COMPLETED,
+                "complexity_score": 5.2,
+                "quality_score": 7.8
+            },
+            {
+                "repository_id": repo_id,
+                "file_path": "src/utils.py",
+                "language": "Python",
+                "status": AnalysisStatus.COMPLETED,
+                "complexity_score": 3.1,
+                "quality_score": 8.9
+            }
+        ])
+        suggestion_repo.create_many(db_session, [
+            {
+                "analysis_id": analysis1_id,
+                "type": SuggestionType.BUG_FIX,
+                "title": "Fix null pointer",
+                "description": "Add null check",
+                "confidence_score": 0.95
+            },
+            {
+                "analysis_id": analysis1_id,
+                "type": SuggestionType.OPTIMIZATION,
+                "title": "Optimize loop",
+                "description": "Use list comprehension",
+                "confidence_score": 0.85
+            },
+            {
+                "analysis_id": analysis2_id,
+                "type": SuggestionType.IMPROVEMENT,
+                "title": "Add docstring",
+                "description": "Add function documentation",
+                "confidence_score": 0.75
+            }
+        ], return_ids=False)
+        db_session.commit()
         
-        suggestion2 = suggestion_repo.create(
-            db_session,
-            analysis_id=analysis1.id,
-            type=SuggestionType.OPTIMIZATION,
-            title="Optimize loop",
-            description="Use list comprehension",
-            confidence_score=0.85
-        )
-        
-        suggestion3 = suggestion_repo.create(
-            db_session,
-            analysis_id=analysis2.id,
-            type=SuggestionType.IMPROVEMENT,
-            title="Add docstring",
-            description="Add function documentation",
-            confidence_score=0.75
-        )
+        assert repository_repo.get_by_url(db_session, repo_url).id == repo_id
         
         # Test repository summary
-        analyses = code_analysis_repo.get_by_repository(db_session, repo.id)
+        analyses = code_analysis_repo.get_by_repository(db_session, repo_id)
         assert len(analyses) == 2
         
-        all_suggestions = suggestion_repo.get_by_repository(db_session, repo.id)
+        all_suggestions = suggestion_repo.get_by_repository(db_session, repo_id)
         assert len(all_suggestions) == 3
         
         # Test workflow completion
@@ -540,7 +780,7 @@ class TestDatabaseIntegration:
         final_workflow = workflow_state_repo.get_by_workflow_id(
             db_session, "integration_test_workflow"
         )
-        assert final_workflow.status == WorkflowStatus.COMPLETED
+        assert final_workflow.status is WorkflowStatus.COMPLETED
         assert final_workflow.total_suggestions == 3
         assert final_workflow.approved_suggestions == 2
         
@@ -549,19 +789,19 @@ class TestDatabaseIntegration:
         db_session.expire_all()
 
         # Manually delete dependent records if cascade isn't working
-        db_session.execute(text("DELETE FROM suggestions WHERE analysis_id IN (SELECT id FROM code_analyses WHERE repository_id = :repo_id)"), {"repo_id": repo.id})
-        db_session.execute(text("DELETE FROM code_analyses WHERE repository_id = :repo_id"), {"repo_id": repo.id})
-        db_session.execute(text("DELETE FROM workflow_states WHERE repository_id = :repo_id"), {"repo_id": repo.id})
+        db_session.execute(text("DELETE FROM suggestions WHERE analysis_id IN (SELECT id FROM code_analyses WHERE repository_id = :repo_id)"), {"repo_id": repo_id})
+        db_session.execute(text("DELETE FROM code_analyses WHERE repository_id = :repo_id"), {"repo_id": repo_id})
+        db_session.execute(text("DELETE FROM workflow_states WHERE repository_id = :repo_id"), {"repo_id": repo_id})
         db_session.commit()
 
         # Now delete the repository
-        success = repository_repo.delete(db_session, repo.id)
+        success = repository_repo.delete(db_session, repo_id)
         db_session.commit()
         assert success is True
         
         # Verify all related data was deleted
-        remaining_analyses = code_analysis_repo.get_by_repository(db_session, repo.id)
+        remaining_analyses = code_analysis_repo.get_by_repository(db_session, repo_id)
         assert len(remaining_analyses) == 0
         
-        remaining_workflows = workflow_state_repo.get_by_repository(db_session, repo.id)
+        remaining_workflows = workflow_state_repo.get_by_repository(db_session, repo_id)
         assert len(remaining_workflows) == 0
\ No newline at end of file
@@ -0,0 +1,148 @@
+#tests/unit/test_core/test_workflow_exceptions.py
+"""
+Unit tests for workflow exception handling.
+Tests synchronous handling and the background failure sink.
+"""
+
+import logging
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.core.exceptions import workflow_exceptions
+from src.core.exceptions.workflow_exceptions import (
+    WorkflowFailureSink, WorkflowTimeoutException, WorkflowDataException,
+    handle_workflow_exception
+)
+
+
+class FakeWorkflowStateRepo:
+    """Records the failure batches passed to record_failures."""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+    
+    def record_failures(self, session, failures):
+        if self.error is not None:
+            raise self.error
+        self.batches.append((session, list(failures)))
+        return len(failures)
+
+
+@pytest.fixture
+def db_sessions(monkeypatch):
+    """Replace get_db_session with a stand-in that counts opened sessions."""
+    opened = []
+    
+    @contextmanager
+    def fake_get_db_session():
+        session = object()
+        opened.append(session)
+        yield session
+    
+    monkeypatch.setattr(workflow_exceptions, "_resolve_db_session", lambda: fake_get_db_session)
+    return opened
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    """Use a fresh failure sink for background handling."""
+    failure_sink = WorkflowFailureSink(flush_interval=0.05)
+    monkeypatch.setattr(workflow_exceptions, "workflow_failure_sink", failure_sink)
+    return failure_sink
+
+
+def _timeout(workflow_id):
+    return WorkflowTimeoutException("Timed out", timeout_seconds=30, workflow_id=workflow_id)
+
+
+class TestHandleWorkflowException:
+    """Test handle_workflow_exception."""
+    
+    def test_handles_synchronously_by_default(self, db_sessions, sink, caplog):
+        """Test the failure is logged and recorded before the call returns."""
+        repo = FakeWorkflowStateRepo()
+        logger = logging.getLogger("test.workflow_exceptions")
+        
+        with caplog.at_level(logging.ERROR, logger=logger.name):
+            details = handle_workflow_exception(_timeout("wf_1"), logger, repo, reraise=False)
+        
+        assert details["workflow_id"] == "wf_1"
+        assert repo.batches == [(db_sessions[0], [("wf_1", "Timed out", "WORKFLOW_TIMEOUT")])]
+        assert caplog.records[0].getMessage() == "Workflow Exception: Timed out"
+        assert caplog.records[0].error_code_name == "WORKFLOW_TIMEOUT"
+        assert sink._thread is None
+    
+    def test_reraises(self, db_sessions):
+        """Test the exception is reraised after being recorded."""
+        repo = FakeWorkflowStateRepo()
+        
+        with pytest.raises(WorkflowTimeoutException):
+            handle_workflow_exception(_timeout("wf_1"), workflow_state_repo=repo)
+        
+        assert len(repo.batches) == 1
+    
+    def test_caller_session_is_used(self, db_sessions):
+        """Test a given session gets the state update and no session is opened."""
+        repo = FakeWorkflowStateRepo()
+        session = object()
+        
+        handle_workflow_exception(_timeout("wf_1"), None, repo, reraise=False, session=session)
+        
+        assert repo.batches == [(session, [("wf_1", "Timed out", "WORKFLOW_TIMEOUT")])]
+        assert db_sessions == []
+    
+    def test_database_error_is_logged(self, db_sessions, caplog):
+        """Test a failed state update is logged instead of raised."""
+        repo = FakeWorkflowStateRepo(error=OperationalError("UPDATE", {}, Exception("locked")))
+        logger = logging.getLogger("test.workflow_exceptions")
+        
+        with caplog.at_level(logging.ERROR, logger=logger.name):
+            handle_workflow_exception(_timeout("wf_1"), logger, repo, reraise=False)
+        
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages[0] == "Workflow Exception: Timed out"
+        assert messages[1].startswith("Failed to update workflow state:")
+
+
+class TestWorkflowFailureSink:
+    """Test background handling through WorkflowFailureSink."""
+    
+    def test_background_batch_is_recorded_on_flush(self, db_sessions, sink, caplog):
+        """Test queued failures are logged and recorded in one session."""
+        repo = FakeWorkflowStateRepo()
+        logger = logging.getLogger("test.workflow_exceptions")
+        
+        with caplog.at_level(logging.ERROR, logger=logger.name):
+            handle_workflow_exception(_timeout("wf_1"), logger, repo, reraise=False, background=True)
+            handle_workflow_exception(
+                WorkflowDataException("Bad data", workflow_id="wf_2"),
+                logger, repo, reraise=False, background=True
+            )
+            sink.flush()
+        
+        assert len(db_sessions) == 1
+        assert repo.batches == [(db_sessions[0], [
+            ("wf_1", "Timed out", "WORKFLOW_TIMEOUT"),
+            ("wf_2", "Bad data", "WORKFLOW_DATA_ERROR")
+        ])]
+        assert len(caplog.records) == 2
+    
+    def test_worker_survives_unexpected_errors(self, db_sessions, sink):
+        """Test the worker keeps processing after a batch raises."""
+        failing_repo = FakeWorkflowStateRepo(error=RuntimeError("boom"))
+        repo = FakeWorkflowStateRepo()
+        
+        sink.submit(None, failing_repo, _timeout("wf_1"))
+        sink.flush()
+        sink.submit(None, repo, _timeout("wf_2"))
+        sink.flush()
+        
+        assert repo.batches[0][1] == [("wf_2", "Timed out", "WORKFLOW_TIMEOUT")]
+    
+    def test_flush_without_submissions(self, sink):
+        """Test flush returns immediately when nothing was queued."""
+        sink.flush()
+        assert sink._thread is None